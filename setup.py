@@ -41,8 +41,10 @@ setup(
         'Topic :: Software Development :: Libraries :: Python Modules'
     ],
     packages=['urilib'],
+    package_data={'urilib': ['public_suffix_list.dat']},
     install_requires=install_requires,
     extras_require={
+        'numpy': ['numpy'],
         ':python_version == "2.7"': ['ipaddress>=1.0.6'],
         ':python_version == "3.2"': ['ipaddress>=1.0.7']
     },
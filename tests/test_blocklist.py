@@ -0,0 +1,96 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from urilib import DomainBlocklist
+
+
+class DomainBlocklistTest(unittest.TestCase):
+
+    DOMAINS = [
+        'example.com',
+        '*.ads.example',
+        '.tracker.example.',
+        'Upper.EXAMPLE.org',
+        '  spaced.example.net\n',
+        '127.0.0.1',
+        '',
+    ]
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def check(self, blocklist):
+        self.assertEqual(len(blocklist), 6)
+        for host in ['example.com', 'www.example.com', 'a.b.example.com.',
+                     'x.ads.example', 'x.y.ads.example', 'a.tracker.example',
+                     'upper.example.org', 'x.UPPER.example.org',
+                     'spaced.example.net', b'www.example.com', '127.0.0.1']:
+            self.assertIn(host, blocklist, msg=host)
+        for host in ['com', 'example.org', 'example.com.au', 'xexample.com',
+                     'ads.example', 'tracker.example', 'example.net',
+                     '0.0.1', '', None]:
+            self.assertNotIn(host, blocklist, msg=host)
+        uris = [
+            'http://www.Example.COM/',
+            b'http://x.ads.example/path',
+            'http://127.0.0.1:8080/',
+            'http://example.org/',
+            'urn:isbn:0451450523',
+        ]
+        self.assertTrue(blocklist.match(uris[0]))
+        self.assertFalse(blocklist.match(uris[3]))
+        self.assertEqual(blocklist.match_many(uris), [
+            True, True, True, False, False
+        ])
+
+    def test_memory(self):
+        self.check(DomainBlocklist(self.DOMAINS))
+
+    def test_file(self):
+        path = os.path.join(self.tmpdir, 'blocklist')
+        DomainBlocklist(self.DOMAINS).save(path)
+        with DomainBlocklist.load(path) as blocklist:
+            self.check(blocklist)
+
+    def test_resize(self):
+        domains = ['%d.example.com' % i for i in range(5000)]
+        blocklist = DomainBlocklist(domains + domains)
+        self.assertEqual(len(blocklist), len(domains))
+        for domain in domains:
+            self.assertIn('www.' + domain, blocklist)
+        self.assertNotIn('5000.example.com', blocklist)
+
+    def test_idna(self):
+        blocklist = DomainBlocklist(['xn--fsq.jp', '*.xn--bcher-kva.de',
+                                     '\xdcnicode.example'])
+        for uri in ['http://xn--fsq.jp/', 'http://\u4f8b.jp/',
+                    b'http://www.xn--bcher-kva.de/', 'http://a.b\xfccher.de',
+                    'http://xn--nicode-2ya.example/']:
+            self.assertTrue(blocklist.match(uri), msg=uri)
+        self.assertFalse(blocklist.match('http://bucher.de/'))
+        self.assertIn('XN--FSQ.JP', blocklist)
+        self.assertIn('a.b\xfccher.de', blocklist)
+
+    def test_ip_address(self):
+        blocklist = DomainBlocklist(['0.1', '10.0.0.1', '[::1]'])
+        self.assertFalse(blocklist.match('http://127.0.0.1/'))
+        self.assertFalse(blocklist.match('http://127.0.0.1:80/'))
+        self.assertTrue(blocklist.match('http://10.0.0.1/'))
+        self.assertTrue(blocklist.match(b'http://[0:0::1]:8080/'))
+        self.assertIn('::1', blocklist)
+        self.assertIn(b'10.0.0.1', blocklist)
+        self.assertNotIn('127.0.0.1', blocklist)
+        self.assertNotIn(b'127.0.0.1', blocklist)
+        self.assertIn('a.0.1', blocklist)  # not an IP address
+
+    def test_invalid(self):
+        path = os.path.join(self.tmpdir, 'invalid')
+        with open(path, 'wb') as f:
+            f.write(b'URISET01' + b'\0' * 64)
+        with self.assertRaises(ValueError):
+            DomainBlocklist.load(path)
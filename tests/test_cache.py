@@ -0,0 +1,100 @@
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from urilib import URICache, urijoin, urinormalize
+
+
+def _normalize(args):
+    path, uris = args
+    with URICache(path) as cache:
+        return cache.normalize_many(uris)
+
+
+class URICacheTest(unittest.TestCase):
+
+    URIS = ['HTTP://Example.COM:80/%d/./x' % i for i in range(100)]
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'cache.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_normalize(self):
+        with URICache(self.path) as cache:
+            expected = [urinormalize(uri) for uri in self.URIS]
+            self.assertEqual(cache.normalize_many(self.URIS), expected)
+            self.assertEqual((cache.hits, cache.misses), (0, 100))
+            self.assertEqual(cache.normalize_many(self.URIS), expected)
+            self.assertEqual((cache.hits, cache.misses), (100, 100))
+            self.assertEqual(cache.hitrate, 0.5)
+            uri = self.URIS[0].encode('ascii')
+            self.assertEqual(cache.normalize(uri), expected[0].encode())
+            self.assertEqual(cache.normalize(bytearray(uri)),
+                             expected[0].encode())
+            self.assertEqual(len(cache), 101)
+        # reopen
+        with URICache(self.path) as cache:
+            self.assertEqual(cache.normalize_many(self.URIS), expected)
+            self.assertEqual((cache.hits, cache.misses), (100, 0))
+            self.assertEqual(cache.hitrate, 1.0)
+
+    def test_join(self):
+        base = 'http://a/b/c/d;p?q'
+        cases = ['g', '../g', '//g', '?y', 'g?y#s', '../../../g']
+        with URICache(self.path) as cache:
+            for ref in cases:
+                self.assertEqual(cache.join(base, ref), urijoin(base, ref))
+                self.assertEqual(cache.join(base.encode(), ref.encode()),
+                                 urijoin(base.encode(), ref.encode()))
+            self.assertEqual(cache.join('http:', 'g', strict=True), 'http:g')
+            self.assertEqual(cache.join('http:', 'g', strict=False),
+                             urijoin('http:', 'g'))
+            # keys for different base/ref splits must not collide
+            self.assertEqual(cache.join('http://a/', 'b'), 'http://a/b')
+            self.assertEqual(cache.join('http://a/b', ''), 'http://a/b')
+            self.assertEqual(cache.misses, 2 * len(cases) + 4)
+
+    def test_eviction(self):
+        with URICache(self.path, maxsize=50) as cache:
+            cache.normalize_many(self.URIS[:40])
+            cache.flush()
+            # use the first entries again
+            cache.normalize_many(self.URIS[:10])
+            cache.flush()
+            cache.normalize_many(self.URIS[40:55])
+            cache.flush()
+            self.assertEqual(len(cache), 45)
+            hits = cache.hits
+            cache.normalize_many(self.URIS[:10])
+            self.assertEqual(cache.hits - hits, 10)
+
+    def test_processes(self):
+        with URICache(self.path) as cache:
+            cache.normalize_many(self.URIS)
+        pool = multiprocessing.Pool(2)
+        try:
+            results = pool.map(_normalize, [(self.path, self.URIS)] * 4)
+        finally:
+            pool.close()
+            pool.join()
+        expected = [urinormalize(uri) for uri in self.URIS]
+        self.assertEqual(results, [expected] * 4)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            URICache(self.path, maxsize=0)
+
+    def test_lazy_import(self):
+        # sqlite3 is only imported when a cache is created
+        path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = 'import sys, urilib; print("sqlite3" in sys.modules)'
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         env=dict(os.environ, PYTHONPATH=path))
+        self.assertEqual(output.strip(), b'False')
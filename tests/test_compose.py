@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
+import io
 import ipaddress
 import unittest
 
-from urilib import uricompose
+from urilib import formencode, uricompose, uricompose_many
 
 
 class ComposeTest(unittest.TestCase):
@@ -182,3 +183,107 @@ class ComposeTest(unittest.TestCase):
         for query in (0, [1]):
             with self.assertRaises(TypeError, msg='query=%r' % query):
                 uricompose(query=query)
+
+    def test_bytes(self):
+        cases = [
+            (b'', dict(path=b'')),
+            (b'foo+bar:', dict(scheme=b'FOO+BAR')),
+            (b'//user@example.com:42', dict(authority=b'user@example.com:42')),
+            (b'//user@[::1]:42', dict(userinfo=b'user', host=b'::1', port=42)),
+            (b'//user@127.0.0.1:42',
+             dict(authority=[b'user', ipaddress.IPv4Address(u'127.0.0.1'),
+                             b'42'])),
+            (b'foo%20bar', dict(path=bytearray(b'foo bar'))),
+            (b'/this:that', dict(path=memoryview(b'this:that'))),
+            (b'?name=foo&type=42', dict(path=b'', query=[(b'name', b'foo'),
+                                                         ('type', 42)])),
+            (b'?name=foo&name=bar', dict(path=b'',
+                                         query={b'name': [b'foo', b'bar']})),
+            (b'?name=a+b', dict(query=b'name=a b')),
+            (b'#a+b', dict(fragment=b'a b')),
+            (b'https://xn--gckc5l.xn--fsq.jp/%E3%83%91%E3%82%B9',
+             dict(scheme='https', host=u'ウェブ.例.jp'.encode('utf-8'),
+                  path=u'/パス')),
+        ]
+        for uri, kwargs in cases:
+            self.check(uri, **kwargs)
+        with self.assertRaises(ValueError):
+            uricompose(authority=b'auth', path=b'foo')
+        with self.assertRaises(ValueError):
+            uricompose(path=b'//foo')
+
+    def test_many(self):
+        rows = [
+            dict(scheme='http', host='example.com', path='/a b'),
+            dict(scheme='http', host='example.com', path='/a b',
+                 query={'q': ['x y', 1, True, 1.0]}),
+            dict(scheme='HTTP', host='Bücher.de', port=8080, path='/a b',
+                 query=[('q', 'x y')], fragment='f g'),
+            dict(authority=['user', '::1', 42], path='/a b', query='a=b c'),
+            dict(authority=('user', '::1', '42'), path='/'),
+            dict(host=b'example.com', path=b'/p', port='80'),
+            dict(path='this:that'),
+            dict(path=bytearray(b'x y'), query=[(bytearray(b'k'), b'v')]),
+        ]
+        expected = [uricompose(**row) for row in rows]
+        self.assertEqual(uricompose_many(rows), expected)
+        # invalid values are not cached
+        with self.assertRaises(ValueError):
+            uricompose_many(rows[3:5] + [
+                dict(authority=('user', '::1', 42.0), path='/')
+            ])
+        with self.assertRaises(TypeError):
+            uricompose_many([dict(foo='bar')])
+        columns = {
+            'scheme': ['http', 'http', 'https'],
+            'host': ['example.com', 'example.com', 'example.org'],
+            'query': [{'a': 1}, {'a': 2}, None],
+        }
+        self.assertEqual(uricompose_many(columns), [
+            'http://example.com?a=1',
+            'http://example.com?a=2',
+            'https://example.org',
+        ])
+        with self.assertRaises(ValueError):
+            uricompose_many({'host': ['a', 'b', 'c'], 'path': ['/x']})
+        self.assertEqual(uricompose_many({'host': [], 'path': []}), [])
+        out = ['x']
+        self.assertIs(uricompose_many(rows[:2], out=out), out)
+        self.assertEqual(out, ['x'] + expected[:2])
+        f = io.BytesIO()
+        uricompose_many([dict(path=b'a'), dict(path=b'b')], out=f)
+        self.assertEqual(f.getvalue(), b'a\nb\n')
+
+
+class FormEncodeTest(unittest.TestCase):
+
+    def test_formencode(self):
+        from collections import OrderedDict as od
+
+        cases = [
+            (b'', []),
+            (b'', {}),
+            (b'name', [('name', None)]),
+            (b'name=foo', {'name': 'foo'}),
+            (b'name=foo&name=bar', {'name': ['foo', 'bar']}),
+            (b'name=42&x=1.5', od([('name', 42), ('x', 1.5)])),
+            (b'a+b=c%26d%3De', [('a b', 'c&d=e')]),
+            (b'name=%E3%81%82', [(b'name', u'あ')]),
+            (b'name=a+b', [(bytearray(b'name'), memoryview(b'a b'))]),
+        ]
+        for body, items in cases:
+            self.assertEqual(formencode(items), body)
+            self.assertIsInstance(formencode(items), bytearray)
+        self.assertEqual(formencode([('a/b', 'c/d')], safe='/'), b'a/b=c/d')
+        self.assertEqual(formencode([('name', u'\xe9')], encoding='latin-1'),
+                         b'name=%E9')
+
+    def test_sink(self):
+        items = [('key%d' % i, 'value %d' % i) for i in range(20000)]
+        body = formencode(items)
+        buf = bytearray(b'prefix')
+        self.assertIs(formencode(items, buf), buf)
+        self.assertEqual(buf, b'prefix' + body)
+        f = io.BytesIO()
+        self.assertIs(formencode(iter(items), f), f)
+        self.assertEqual(f.getvalue(), body)
@@ -0,0 +1,47 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from urilib import uridedup, urinormalize
+
+
+class DedupTest(unittest.TestCase):
+
+    URIS = ['http://Example.com/%d' % (i % 250) for i in range(1000)] + [
+        'http://example.com:80/%d' % i for i in range(500)
+    ]
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def expected(self):
+        seen = {}
+        for uri in self.URIS:
+            seen.setdefault(urinormalize(uri), uri)
+        return sorted(seen.items())
+
+    def check(self, **kwargs):
+        result = list(uridedup(self.URIS, tmpdir=self.tmpdir, **kwargs))
+        self.assertEqual(result, self.expected())
+        self.assertEqual(os.listdir(self.tmpdir), [])
+
+    def test_memory(self):
+        self.check()
+
+    def test_spill(self):
+        self.check(maxmem=4096)
+
+    def test_merge_passes(self):
+        self.check(maxmem=512)
+
+    def test_processes(self):
+        self.check(maxmem=16384, processes=2)
+
+    def test_key(self):
+        result = list(uridedup(['b', 'A', 'a', 'B'], key=str.lower))
+        self.assertEqual(result, [('a', 'A'), ('b', 'b')])
+        self.assertEqual(list(uridedup([])), [])
@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 import unittest
 
-from urilib import (RESERVED, UNRESERVED, uriencode, uriencode_plus,
-                    uridecode, uridecode_plus, uridecode_safe,
+from urilib import (RESERVED, UNRESERVED, idndecode, idndecode_many,
+                    idnencode, idnencode_many, pctnormalize, uriencode,
+                    uriencode_plus, uridecode, uridecode_plus, uridecode_safe,
                     uridecode_safe_plus)
 
 
@@ -75,6 +76,19 @@ class EncodingTest(unittest.TestCase):
         for input, output in cases:
             self.assertEqual(uriencode(input), output)
 
+    def test_uriencode_plus(self):
+        cases = [
+            ('', ''),
+            ('%+', '%25%2B'),
+            ('a b', 'a+b'),
+            ('あ い', '%E3%81%82+%E3%81%84'),
+            (b'a b/c', b'a+b%2Fc'),
+        ]
+        for input, output in cases:
+            self.assertEqual(uriencode_plus(input), output)
+        self.assertEqual(uriencode_plus('a b/c', safe='/'), 'a+b/c')
+        self.assertEqual(uriencode_plus(b'a b/c', safe=b'/ '), b'a+b/c')
+
     def test_uridecode(self):
         cases = [
             ('%', '%'),
@@ -104,9 +118,83 @@ class EncodingTest(unittest.TestCase):
         for input, output in cases:
             self.assertEqual(uridecode_safe(input), output)
 
+    def test_decode_invalid(self):
+        # only hexadecimal digits form percent-encodings
+        for input in ['% a', '%a ', '%+a', '%-1', '%0x', '%']:
+            self.assertEqual(uridecode(input), input)
+            self.assertEqual(uridecode_safe(input), input)
+            self.assertEqual(uridecode_safe(input.encode()), input.encode())
+
+    def test_decode_plain(self):
+        for input in ('', 'foo/bar', b'foo/bar'):
+            self.assertIs(uridecode(input), input)
+            self.assertIs(uridecode_safe(input), input)
+        self.assertEqual(uridecode_safe('foo', encoding='utf-16'),
+                         b'foo'.decode('utf-16', 'replace'))
+
+    def test_pctnormalize(self):
+        cases = [
+            ('', ''),
+            ('foo', 'foo'),
+            ('%7e%7E', '~~'),
+            ('%41%5a%61%7a%30%39%2d%2e%5f', 'AZaz09-._'),
+            ('%2f%2F', '%2F%2F'),
+            ('%e3%81%82', '%E3%81%82'),
+            ('%', '%'),
+            ('%Z', '%Z'),
+            ('%ZZ%7e', '%ZZ~'),
+            ('%%7e', '%~'),
+            ('%7', '%7'),
+            ('a+b%20c', 'a+b%20c'),
+            ('あ%7e', 'あ~'),
+            (b'%7e%2f', b'~%2F'),
+            (b'%', b'%'),
+        ]
+        for input, output in cases:
+            self.assertEqual(pctnormalize(input), output)
+
     def test_encode_bytes(self):
         cases = [
             (b'\xf6lk\xfcrbis', b'%F6lk%FCrbis')
         ]
         for input, output in cases:
             self.assertEqual(uriencode(input), output)
+
+    def test_idnencode(self):
+        cases = [
+            ('', ''),
+            ('example.com', 'example.com'),
+            ('Example.COM.', 'Example.COM.'),
+            ('XBLAのXbox.com', 'xn--xblaxbox-jf4g.com'),
+            ('ウェブ。例．jp', 'xn--gckc5l.xn--fsq.jp'),
+            ('xn--gckc5l.xn--fsq.jp', 'xn--gckc5l.xn--fsq.jp'),
+            (b'example.com', b'example.com'),
+            (u'ウェブ.例.jp'.encode('utf-8'), b'xn--gckc5l.xn--fsq.jp'),
+        ]
+        for input, output in cases:
+            self.assertEqual(idnencode(input), output)
+        self.assertEqual(idnencode_many([c[0] for c in cases]),
+                         [c[1] for c in cases])
+        for input in ('.', 'a..b', 'a' * 64 + '.com', 'com.' + 'a' * 64):
+            with self.assertRaises(UnicodeError, msg='input=%r' % input):
+                idnencode(input)
+        with self.assertRaises(UnicodeError):
+            idnencode('example.com', errors='replace')
+
+    def test_idndecode(self):
+        cases = [
+            ('', ''),
+            ('example.com', 'example.com'),
+            ('Example.COM.', 'Example.COM.'),
+            ('xn--xblaxbox-jf4g.com', 'xblaのxbox.com'),
+            ('xn--gckc5l.xn--fsq.jp.', 'ウェブ.例.jp.'),
+            ('ウェブ。例．jp', 'ウェブ.例.jp'),
+            (b'xn--gckc5l.xn--fsq.jp', u'ウェブ.例.jp'.encode('utf-8')),
+        ]
+        for input, output in cases:
+            self.assertEqual(idndecode(input), output)
+        self.assertEqual(idndecode_many([c[0] for c in cases]),
+                         [c[1] for c in cases])
+        for input in ('.', 'a..b', 'a' * 64 + '.com'):
+            with self.assertRaises(UnicodeError, msg='input=%r' % input):
+                idndecode(input)
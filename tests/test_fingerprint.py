@@ -0,0 +1,53 @@
+import array
+import hashlib
+import unittest
+
+from urilib import urifingerprint, urifingerprint_many, urinormalize
+
+
+class FingerprintTest(unittest.TestCase):
+
+    def test_equivalent(self):
+        cases = [
+            ('http://www.Example.com:80/a/../b?x=1#f',
+             'http://www.example.com/b?x=1#f',
+             b'http://www.example.com/b?x=1#f'),
+            ('http://example.com/%7efoo', 'HTTP://example.com./~foo'),
+        ]
+        for uris in cases:
+            for bits in (64, 128):
+                values = set(urifingerprint(uri, bits) for uri in uris)
+                self.assertEqual(len(values), 1, msg='uris=%r' % (uris,))
+
+    def test_distinct(self):
+        uris = ['http://example.com/', 'http://example.com/?a',
+                'http://example.com/#', 'https://example.com/',
+                'http://example.com/a', 'http://example.com/a?b',
+                'http://example.com/a#b', 'urn:example', 'example:urn']
+        values = set(urifingerprint(uri) for uri in uris)
+        self.assertEqual(len(values), len(uris))
+
+    def test_stable(self):
+        uri = 'http://www.example.com/b?x=1#f'
+        for bits in (8, 64, 128, 512):
+            digest = hashlib.blake2b(urinormalize(uri).encode('utf-8'),
+                                     digest_size=bits // 8).digest()
+            self.assertEqual(urifingerprint(uri, bits),
+                             int.from_bytes(digest, 'big'))
+        self.assertEqual(urifingerprint(uri), 9343714749883320207)
+        for bits in (0, 12, 520):
+            with self.assertRaises(ValueError, msg='bits=%r' % bits):
+                urifingerprint(uri, bits)
+
+    def test_many(self):
+        uris = ['http://example.com/', 'http://example.com/a',
+                b'http://example.com/b']
+        expected = [urifingerprint(uri) for uri in uris]
+        result = urifingerprint_many(uris)
+        self.assertIsInstance(result, array.array)
+        self.assertEqual(result.tolist(), expected)
+        out = array.array('Q', [0] * 4)
+        self.assertIs(urifingerprint_many(uris, out=out), out)
+        self.assertEqual(out.tolist(), expected + [0])
+        self.assertEqual(urifingerprint_many(uris, 128),
+                         [urifingerprint(uri, 128) for uri in uris])
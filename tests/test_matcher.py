@@ -0,0 +1,95 @@
+import unittest
+
+from urilib import URIMatcher
+
+
+class URIMatcherTest(unittest.TestCase):
+
+    RULES = [
+        'example.com',
+        'example.com/private/*',
+        'Example.com/login',
+        '*.example.net',
+        '*.example.net/api/*',
+        '*/admin/*',
+        '/robots.txt',
+        'ad?.example.org/*',
+        'example.org/*.php',
+        're:.*\\.(gif|png)\\Z',
+        're:[^/]*\\.tracker\\.com/',
+    ]
+
+    def test_match(self):
+        matcher = URIMatcher(self.RULES)
+        self.assertEqual(len(matcher), len(self.RULES))
+        cases = [
+            ('http://example.com/', [0]),
+            ('http://EXAMPLE.com/private/x', [0, 1]),
+            ('http://example.com/private', [0]),
+            ('http://example.com/login', [0, 2]),
+            ('http://example.com/Login', [0]),
+            ('http://example.com/admin/', [0, 5]),
+            ('http://example.net/', []),
+            ('http://www.example.net/', [3]),
+            ('http://a.b.example.net/api/v1', [3, 4]),
+            ('http://example.org/robots.txt', [6]),
+            ('http://ads.example.org/', [7]),
+            ('http://ad.example.org/', []),
+            ('http://example.org/x/index.php', [8]),
+            ('http://example.org/index.php5', []),
+            ('http://www.tracker.com/', [10]),
+            ('http://tracker.com/', []),
+            ('http://example.org/a.png', [9]),
+            ('urn:isbn:0451450523', []),
+        ]
+        for uri, expected in cases:
+            rules = [self.RULES[i] for i in expected]
+            self.assertEqual(matcher.match(uri), rules, msg=uri)
+            self.assertEqual(matcher.match(uri.encode()), rules, msg=uri)
+
+    def test_match_many(self):
+        matcher = URIMatcher(self.RULES)
+        uris = ['http://example.com/', 'http://x.y/', 'http://www.example.net']
+        self.assertEqual(matcher.match_many(uris), [
+            ['example.com'], [], ['*.example.net']
+        ])
+
+    def test_empty(self):
+        matcher = URIMatcher([])
+        self.assertEqual(len(matcher), 0)
+        self.assertEqual(matcher.match('http://example.com/'), [])
+
+    def test_idna(self):
+        rules = ['*.xn--fsq.jp', 'XN--BCHER-KVA.de/a', 'b\xfccher.de/b*',
+                 'x*.xn--fsq.jp']
+        matcher = URIMatcher(rules)
+        self.assertEqual(matcher.match('http://a.xn--fsq.jp/'), [rules[0]])
+        self.assertEqual(matcher.match('http://xa.\u4f8b.jp/'),
+                         [rules[0], rules[3]])
+        self.assertEqual(matcher.match(b'http://xn--bcher-kva.de/a'),
+                         [rules[1]])
+        self.assertEqual(matcher.match('http://B\xfcCHER.de/b/c'),
+                         [rules[2]])
+
+    def test_ip_address(self):
+        rules = ['[::1]/admin', '[0:0::1]/*', '127.0.0.1', '[::1]/a?min']
+        matcher = URIMatcher(rules)
+        self.assertEqual(matcher.match('http://[::1]/admin'), rules[:2] +
+                         rules[3:])
+        self.assertEqual(matcher.match('http://[0::1]:8080/x'), [rules[1]])
+        self.assertEqual(matcher.match('http://127.0.0.1/x'), [rules[2]])
+        self.assertEqual(matcher.match('http://127.0.0.2/x'), [])
+
+    def test_regex(self):
+        rules = [r're:(?i)example\.com/', r're:(a)\1', r're:(x)(y)\2',
+                 r're:(?P<n>b)(?P=n)', r're:[a-z]+\.org/']
+        matcher = URIMatcher(rules)
+        self.assertEqual(matcher.match('http://EXAMPLE.com/'), [rules[0]])
+        self.assertEqual(matcher.match('http://aa/'), [rules[1]])
+        self.assertEqual(matcher.match('http://xyy/'), [rules[2]])
+        self.assertEqual(matcher.match('http://bb.org/'),
+                         [rules[3], rules[4]])
+        self.assertEqual(matcher.match('http://xy/'), [])
+        with self.assertRaises(ValueError) as cm:
+            URIMatcher(['example.com', 're:(unbalanced'])
+        self.assertIn('re:(unbalanced', str(cm.exception))
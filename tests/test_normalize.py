@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 import unittest
 
-from urilib import urinormalize
+from urilib import (NormalizationPolicy, uriequivalent, uriequivalent_many,
+                    urinormalize)
 
 
 class NormalizeTest(unittest.TestCase):
@@ -42,6 +43,11 @@ class NormalizeTest(unittest.TestCase):
             # u'http://xn--q-bga.XBLA\u306eXbox.com'.encode('utf-8'): b'http://q\xc3\xa9.xbla\xe3\x81\xaexbox.com'.decode('utf-8'),
             ('http://ja.wikipedia.org/wiki/%E3%82%AD%E3%83%A3%E3%82%BF%E3%83%94%E3%83%A9%E3%83%BC%E3%82%B8%E3%83%A3%E3%83%91%E3%83%B3', 'http://ja.wikipedia.org/wiki/%E3%82%AD%E3%83%A3%E3%82%BF%E3%83%94%E3%83%A9%E3%83%BC%E3%82%B8%E3%83%A3%E3%83%91%E3%83%B3'),
             ('http://test.example/キ', 'http://test.example/%E3%82%AD'),
+            # test unicode normalization
+            (u'http://test.example/cafe\u0301',
+             'http://test.example/caf%C3%A9'),
+            ('http://test.example/cafe%CC%81',
+             'http://test.example/caf%C3%A9'),
 
             # check that %23 (#) is not escaped where it shouldn't be
             ('http://test.example/?p=%23val#test-%23-val%25', 'http://test.example/?p=%23val#test-%23-val%25'),
@@ -68,3 +74,89 @@ class NormalizeTest(unittest.TestCase):
         ]
         for uri, good in cases:
             self.check(good, uri=uri)
+
+        for uri, good in cases:
+            good = good.encode('utf-8')
+            self.check(good, uri=uri.encode('utf-8'))
+            self.check(good, uri=bytearray(uri.encode('utf-8')))
+            self.check(good, uri=memoryview(uri.encode('utf-8')))
+
+
+class NormalizationPolicyTest(unittest.TestCase):
+
+    def test_normalize(self):
+        policy = NormalizationPolicy(
+            strip_params=['utm_*', 'fbclid'],
+            sort_query=True,
+            drop_fragment=True,
+            index_pages=['index.html', 'index.php'],
+            lowercase_path_hosts=['Example.ORG']
+        )
+        cases = [
+            ('HTTP://Example.COM:80/a/./b?utm_source=x&b=2&fbclid=y&a=1#top',
+             'http://example.com/a/b?a=1&b=2'),
+            ('http://example.com/?utm_source=x&utm_medium=y',
+             'http://example.com/'),
+            ('http://example.com/?b=1&a=2&b=0&utm=3',
+             'http://example.com/?a=2&b=1&b=0&utm=3'),
+            ('http://example.com/docs/index.html',
+             'http://example.com/docs/'),
+            ('http://example.com/index.php?q', 'http://example.com/?q'),
+            ('http://example.com/index.htm', 'http://example.com/index.htm'),
+            ('http://example.com/Docs/', 'http://example.com/Docs/'),
+            ('http://EXAMPLE.org/Docs/INDEX.html', 'http://example.org/docs/'),
+            ('mailto:me@example.com#x', 'mailto:me@example.com'),
+        ]
+        for uri, good in cases:
+            self.assertEqual(policy.normalize(uri), good)
+            self.assertEqual(policy.normalize(uri.encode('utf-8')),
+                             good.encode('utf-8'))
+        uris = [uri for uri, _ in cases]
+        self.assertEqual(policy.normalize_many(uris),
+                         [good for _, good in cases])
+
+    def test_default(self):
+        policy = NormalizationPolicy()
+        for uri in ['http://Example.COM/index.html?b&a=1&utm_x#f',
+                    'urn:ISBN:0451450523']:
+            self.assertEqual(policy.normalize(uri), urinormalize(uri))
+
+
+class EquivalentTest(unittest.TestCase):
+
+    def test_equivalent(self):
+        uris = [
+            'http://example.com/a',
+            'HTTP://Example.COM:80/./a',
+            'http://example.com/%61',
+            'http://example.com./b/../a',
+        ]
+        for a in uris:
+            for b in uris:
+                self.assertTrue(uriequivalent(a, b), msg=(a, b))
+            self.assertTrue(uriequivalent(a.encode(), b'http://example.com/a'))
+        cases = [
+            'https://example.com/a',
+            'http://example.com:8080/a',
+            'http://user@example.com/a',
+            'http://example.com/a/',
+            'http://example.com/a?b',
+            'http://example.com/a#',
+            b'http://example.com/a',
+        ]
+        for uri in cases:
+            self.assertFalse(uriequivalent('http://example.com/a', uri),
+                             msg=uri)
+        self.assertTrue(uriequivalent(
+            'http://Bücher.de/ä?q=a%20b#%66',
+            'http://xn--bcher-kva.de/%C3%A4?q=a+b#f'
+        ))
+
+    def test_equivalent_many(self):
+        self.assertEqual(uriequivalent_many('http://example.com/', [
+            'http://EXAMPLE.com',
+            'http://example.com:80/',
+            'https://example.com/',
+            'http://example.com/?q',
+        ]), [True, True, False, False])
+        self.assertEqual(uriequivalent_many('http://example.com/', []), [])
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from urilib import (SplitResultArray, packed, uridecode_safe,
+                    uridecode_safe_packed, urisplit, urisplit_packed)
+
+COMPONENTS = [
+    b'',
+    b'/foo/bar',
+    b'/a%20b/%7e%7E',
+    b'caf%C3%A9',
+    b'%e3%81%82%',
+    b'%0a%1f%7f%20',
+    b'%% a%+a%zz%4',
+    b'%',
+    b'%C3',
+    b'\xc3\xa9%ff',
+    b'%2',
+    b'41',
+]
+
+
+def _pack(components):
+    offsets = [0]
+    for component in components:
+        offsets.append(offsets[-1] + len(component))
+    return b''.join(components), offsets
+
+
+def _unpack(data, offsets):
+    return [bytes(data[offsets[i]:offsets[i + 1]])
+            for i in range(len(offsets) - 1)]
+
+
+class PackedTest(unittest.TestCase):
+
+    def check(self, decode, encoding='utf-8'):
+        expected = [uridecode_safe(c, encoding) for c in COMPONENTS]
+        data, offsets = _pack(COMPONENTS)
+        result = decode(data, offsets, encoding, 'replace')
+        self.assertEqual(_unpack(*result), expected)
+        # slices of a larger buffer
+        result = decode(b'%41' + data + b'%41', [o + 3 for o in offsets],
+                        encoding, 'replace')
+        self.assertEqual(_unpack(*result), expected)
+        result = decode(data, [0], encoding, 'replace')
+        self.assertEqual(_unpack(*result), [])
+
+    def test_python(self):
+        self.check(packed._decode_python)
+        self.check(packed._decode_python, 'latin-1')
+
+    @unittest.skipIf(packed.numpy is None, 'requires numpy')
+    def test_numpy(self):
+        self.check(packed._decode_numpy)
+        self.check(packed._decode_numpy, 'latin-1')
+        data, offsets = _pack(COMPONENTS)
+        with self.assertRaises(UnicodeDecodeError):
+            packed._decode_numpy(data, offsets, 'utf-8', 'strict')
+
+    def test_decode(self):
+        data, offsets = _pack([b'a%20b', b'caf%C3%A9'])
+        data, offsets = uridecode_safe_packed(bytearray(data), offsets)
+        self.assertEqual(bytes(data), b'a bcaf\xc3\xa9')
+        self.assertEqual(list(offsets), [0, 3, 8])
+
+
+URIS = [
+    b'',
+    b'http://user@example.com:8080/path?query#fragment',
+    b'http:',
+    b'http://',
+    b'//example.com',
+    b'?#',
+    b'foo:bar:baz',
+    b':foo',
+    b'/foo:bar',
+    b'a?b:c#d/e',
+    b'x://a#b\nc',
+    b'#',
+    b'mailto:me@example.com',
+]
+
+
+class SplitPackedTest(unittest.TestCase):
+
+    def check(self, split):
+        data, offsets = _pack(URIS)
+        data = b'http://' + data
+        offsets = [o + 7 for o in offsets]
+        starts, ends = split(data, offsets)
+        self.assertEqual(len(starts), len(URIS))
+        self.assertEqual(len(ends), len(URIS))
+        for i, uri in enumerate(URIS):
+            parts = []
+            for start, end in zip(starts[i], ends[i]):
+                if start < 0:
+                    self.assertEqual(end, -1)
+                    parts.append(None)
+                else:
+                    parts.append(data[start:end])
+            self.assertEqual(tuple(parts), tuple(urisplit(uri)), msg=uri)
+        starts, ends = split(data, [0])
+        self.assertEqual(len(starts), 0)
+        self.assertEqual(len(ends), 0)
+
+    def test_python(self):
+        self.check(packed._split_python)
+
+    @unittest.skipIf(packed.numpy is None, 'requires numpy')
+    def test_numpy(self):
+        self.check(packed._split_numpy)
+
+    def test_split(self):
+        data, offsets = _pack([b'http://example.com/', b'foo'])
+        starts, ends = urisplit_packed(data, offsets)
+        self.assertEqual(list(starts[0]), [0, 7, 18, -1, -1])
+        self.assertEqual(list(ends[0]), [4, 18, 19, -1, -1])
+        self.assertEqual(list(starts[1]), [-1, -1, 19, -1, -1])
+        self.assertEqual(list(ends[1]), [-1, -1, 22, -1, -1])
+
+
+# attaches results shared by a child process after it has exited; a
+# forked child starts its own resource tracker, which exits soon after
+_SHARE_SCRIPT = """
+import multiprocessing
+import time
+from urilib import SplitResultArray, urisplit
+
+def share(queue):
+    queue.put(SplitResultArray(['http://example.com/a', 'b']).share())
+
+if __name__ == '__main__':
+    for method in ['fork', 'spawn']:
+        if method not in multiprocessing.get_all_start_methods():
+            continue
+        context = multiprocessing.get_context(method)
+        queue = context.Queue()
+        process = context.Process(target=share, args=(queue,))
+        process.start()
+        name = queue.get()
+        process.join()
+        time.sleep(0.5)
+        with SplitResultArray.attach(name) as results:
+            assert list(results) == [urisplit('http://example.com/a'),
+                                     urisplit('b')]
+"""
+
+
+def _share(uris):
+    return SplitResultArray(uris).share()
+
+
+class SplitResultArrayTest(unittest.TestCase):
+
+    URIS = [
+        'http://user@example.com:8080/path?query#fragment',
+        '',
+        'foo:bar',
+        '//example.com',
+        'ü:/päth?ä#ö',
+        'http://[::1]/',
+    ]
+
+    def check(self, results, uris):
+        self.assertEqual(len(results), len(uris))
+        self.assertEqual(list(results), [urisplit(uri) for uri in uris])
+        if uris:
+            self.assertEqual(results[-1], urisplit(uris[-1]))
+        with self.assertRaises(IndexError):
+            results[len(uris)]
+
+    def test_local(self):
+        self.check(SplitResultArray(self.URIS), self.URIS)
+        uris = [uri.encode('utf-8') for uri in self.URIS]
+        self.check(SplitResultArray(uris), uris)
+        self.check(SplitResultArray([]), [])
+        results = SplitResultArray([bytearray(b'a:b'), memoryview(b'c')])
+        self.check(results, [b'a:b', b'c'])
+        for uris in (['a', b'b'], [b'a', 'b'], ['a', None], [1]):
+            with self.assertRaises(TypeError):
+                SplitResultArray(uris)
+
+    def test_share(self):
+        uris = [uri.encode('utf-8') for uri in self.URIS]
+        name = SplitResultArray(uris).share()
+        with SplitResultArray.attach(name) as results:
+            self.check(results, uris)
+        with self.assertRaises(FileNotFoundError):
+            SplitResultArray.attach(name)
+
+    def test_process(self):
+        pool = multiprocessing.Pool(1)
+        try:
+            name = pool.apply(_share, (self.URIS,))
+        finally:
+            pool.close()
+            pool.join()
+        with SplitResultArray.attach(name) as results:
+            self.check(results, self.URIS)
+
+    def test_lazy_import(self):
+        # multiprocessing is only imported when results are shared
+        path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = 'import sys, urilib; print("multiprocessing" in sys.modules)'
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         env=dict(os.environ, PYTHONPATH=path))
+        self.assertEqual(output.strip(), b'False')
+
+    def test_exited_process(self):
+        path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=path)
+        tmpdir = tempfile.mkdtemp()
+        try:
+            # spawned processes import their target from a script file
+            script = os.path.join(tmpdir, 'share.py')
+            with open(script, 'w') as f:
+                f.write(_SHARE_SCRIPT)
+            result = subprocess.run([sys.executable, script],
+                                    stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE,
+                                    env=env, timeout=60)
+        finally:
+            shutil.rmtree(tmpdir)
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertNotIn(b'resource_tracker', result.stderr)
+        self.assertNotIn(b'leaked', result.stderr)
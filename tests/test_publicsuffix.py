@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+import io
+import ipaddress
+import unittest
+
+from urilib import (PublicSuffixList, getpublicsuffix, getregistrabledomain,
+                    getregistrabledomains)
+
+
+class PublicSuffixTest(unittest.TestCase):
+
+    RULES = ['com', 'jp', '*.kawasaki.jp', '!city.kawasaki.jp', 'uk',
+             'co.uk', '*.ck', '!www.ck', '公司.cn', 'cn']
+
+    def check(self, psl, host, suffix, domain):
+        self.assertEqual(psl.getpublicsuffix(host), suffix,
+                         msg='public suffix of %r' % host)
+        self.assertEqual(psl.getregistrabledomain(host), domain,
+                         msg='registrable domain of %r' % host)
+
+    def test_rules(self):
+        psl = PublicSuffixList(self.RULES)
+        cases = [
+            ('com', 'com', None),
+            ('example.com', 'com', 'example.com'),
+            ('www.example.com', 'com', 'example.com'),
+            ('WWW.Example.COM', 'com', 'example.com'),
+            ('www.example.com.', 'com', 'example.com'),
+            ('example', 'example', None),
+            ('www.example.example', 'example', 'example.example'),
+            ('co.uk', 'co.uk', None),
+            ('www.example.co.uk', 'co.uk', 'example.co.uk'),
+            ('kawasaki.jp', 'jp', 'kawasaki.jp'),
+            ('test.kawasaki.jp', 'test.kawasaki.jp', None),
+            ('www.test.kawasaki.jp', 'test.kawasaki.jp',
+             'www.test.kawasaki.jp'),
+            ('city.kawasaki.jp', 'kawasaki.jp', 'city.kawasaki.jp'),
+            ('www.city.kawasaki.jp', 'kawasaki.jp', 'city.kawasaki.jp'),
+            ('www.ck', 'ck', 'www.ck'),
+            ('www.www.ck', 'ck', 'www.ck'),
+            ('test.ck', 'test.ck', None),
+            ('www.test.ck', 'test.ck', 'www.test.ck'),
+            ('食狮.公司.cn', '公司.cn', '食狮.公司.cn'),
+            ('xn--85x722f.xn--55qx5d.cn', 'xn--55qx5d.cn',
+             'xn--85x722f.xn--55qx5d.cn'),
+            (b'www.example.com', b'com', b'example.com'),
+        ]
+        for host, suffix, domain in cases:
+            self.check(psl, host, suffix, domain)
+
+    def test_not_registered_name(self):
+        psl = PublicSuffixList(self.RULES)
+        for host in (None, '', '.com', 'example..com',
+                     ipaddress.IPv4Address(u'127.0.0.1'),
+                     ipaddress.IPv6Address(u'::1')):
+            self.assertEqual(psl.getpublicsuffix(host, 'x'), 'x')
+            self.assertEqual(psl.getregistrabledomain(host, 'x'), 'x')
+
+    def test_invalid_rule(self):
+        for rule in ('', '.', 'example..com'):
+            with self.assertRaises(ValueError, msg='rule=%r' % rule):
+                PublicSuffixList([rule])
+
+    def test_batch(self):
+        psl = PublicSuffixList(self.RULES)
+        hosts = ['www.example.com', 'co.uk', 'a.example.com', None,
+                 'www.example.com']
+        self.assertEqual(psl.getregistrabledomains(hosts), [
+            'example.com', None, 'example.com', None, 'example.com'
+        ])
+        self.assertEqual(psl.getpublicsuffixes(hosts), [
+            'com', 'co.uk', 'com', None, 'com'
+        ])
+
+    def test_dump_load(self):
+        psl = PublicSuffixList(self.RULES)
+        buf = io.StringIO()
+        psl.dump(buf)
+        buf.seek(0)
+        loaded = PublicSuffixList.load(buf)
+        for host in ('www.example.co.uk', 'www.city.kawasaki.jp',
+                     'www.test.kawasaki.jp', '食狮.公司.cn'):
+            self.assertEqual(psl.getregistrabledomain(host),
+                             loaded.getregistrabledomain(host))
+        with self.assertRaises(ValueError):
+            PublicSuffixList.load(io.StringIO(u'{"version": 0}'))
+
+    def test_fromfile(self):
+        psl = PublicSuffixList.fromfile(private=False)
+        self.assertEqual(psl.getregistrabledomain('foo.github.io'),
+                         'github.io')
+        psl = PublicSuffixList.fromfile()
+        self.assertEqual(psl.getregistrabledomain('foo.github.io'),
+                         'foo.github.io')
+
+    def test_bundled(self):
+        self.assertEqual(getpublicsuffix('www.example.co.uk'), 'co.uk')
+        self.assertEqual(getregistrabledomain('www.example.co.uk'),
+                         'example.co.uk')
+        self.assertEqual(getregistrabledomains(['a.example.com', 'com']),
+                         ['example.com', None])
@@ -0,0 +1,67 @@
+import unittest
+
+from urilib import URIRelativizer, urijoin, urirelativize
+
+
+class RelativizeTest(unittest.TestCase):
+
+    RFC3986_BASE = "http://a/b/c/d;p?q"
+
+    def check(self, base, target, expected):
+        result = urirelativize(base, target)
+        self.assertEqual(expected, result)
+        self.assertEqual(urijoin(base, target), urijoin(base, result))
+
+    def test_relativize(self):
+        self.check(self.RFC3986_BASE, "g:h", "g:h")
+        self.check(self.RFC3986_BASE, "http://a/b/c/g", "g")
+        self.check(self.RFC3986_BASE, "http://a/b/c/g/", "g/")
+        self.check(self.RFC3986_BASE, "http://a/g", "/g")
+        self.check(self.RFC3986_BASE, "http://g", "//g")
+        self.check(self.RFC3986_BASE, "http://a/b/c/d;p?y", "?y")
+        self.check(self.RFC3986_BASE, "http://a/b/c/d;p?q#s", "#s")
+        self.check(self.RFC3986_BASE, "http://a/b/c/d;p?q", "")
+        self.check(self.RFC3986_BASE, "http://a/b/c/d;p", "d;p")
+        self.check(self.RFC3986_BASE, "http://a/b/c/", "./")
+        self.check(self.RFC3986_BASE, "http://a/b/", "../")
+        self.check(self.RFC3986_BASE, "http://a/b/g", "../g")
+        self.check(self.RFC3986_BASE, "http://a/", "/")
+        self.check(self.RFC3986_BASE, "http://a", "//a")
+        self.check(self.RFC3986_BASE, "http://a/b/c/x:y", "./x:y")
+        self.check(self.RFC3986_BASE, "http://a/b/c//y", ".//y")
+        self.check(self.RFC3986_BASE, "https://a/b/c/g", "https://a/b/c/g")
+        self.check("http://a", "http://a/x", "x")
+        self.check("http://a?q", "http://a", "//a")
+        self.check("foo:a/b", "c", "c")
+        self.check("foo:a/b", "../c", "../c")
+        self.check("foo:a/b", "/c", "/c")
+
+    def test_resolve(self):
+        # relative targets and dot segments are resolved first
+        self.check(self.RFC3986_BASE, "../g", "../g")
+        self.check(self.RFC3986_BASE, "http://a/b/./c/../x", "../x")
+        self.check(self.RFC3986_BASE, "g/../h", "h")
+
+    def test_base_segments(self):
+        # dot and empty segments of the base path
+        self.check("http://example.com/a/./b.html",
+                   "http://example.com/a/c.html", "c.html")
+        self.check("http://example.com/a/b/../c.html",
+                   "http://example.com/a/d.html", "d.html")
+        self.check("http://example.com/a/..", "http://example.com/a/x",
+                   "x")
+        self.check("http://a//a/../b", "http://a/x", "/x")
+        self.check("http://a//a/../b", "http://a//x", "x")
+        self.check("http://a/b//c", "http://a/b/d", "../d")
+
+    def test_bytes(self):
+        self.assertEqual(urirelativize(b'http://a/b/c', b'http://a/d?q'),
+                         b'/d?q')
+
+    def test_relativizer(self):
+        relativizer = URIRelativizer(self.RFC3986_BASE)
+        self.assertEqual(relativizer.relativize_many([
+            'http://a/b/c/g',
+            'http://a/b/x/y',
+            'http://b/',
+        ]), ['g', '../x/y', '//b/'])
@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from urilib import URISeenFilter
+
+
+class SeenFilterTest(unittest.TestCase):
+
+    URIS = ['http://example.com/%d' % i for i in range(1000)]
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def check(self, f):
+        # allow for false positives while adding
+        added = sum(f.add_many(self.URIS))
+        self.assertGreater(added, 0.98 * len(self.URIS))
+        self.assertEqual(len(f), added)
+        self.assertTrue(all(f.contains_many(self.URIS)))
+        self.assertFalse(f.add('HTTP://Example.COM:80/0'))
+        self.assertIn('http://example.com/./1', f)
+        others = ['http://example.org/%d' % i for i in range(1000)]
+        self.assertLess(sum(f.contains_many(others)), 50)
+
+    def test_memory(self):
+        self.check(URISeenFilter(len(self.URIS), 0.01))
+
+    def test_zero_step(self):
+        # fingerprints with a zero second half still probe distinct bits
+        f = URISeenFilter(1000, 0.001)
+        self.assertGreater(f._nhashes, 1)
+        with mock.patch('urilib.seenfilter.urifingerprint',
+                        return_value=12345 << 64):
+            indexes = f._indexes('http://example.com/')
+        self.assertEqual(len(set(indexes)), len(indexes))
+
+    def test_file(self):
+        path = os.path.join(self.tmpdir, 'seen')
+        with URISeenFilter.create(path, len(self.URIS)) as f:
+            self.check(f)
+        with URISeenFilter.open(path) as f:
+            count = len(f)
+            self.assertTrue(all(f.contains_many(self.URIS)))
+            with self.assertRaises(ValueError):
+                f.add('http://example.org/')
+        with URISeenFilter.open(path, readonly=False) as f:
+            self.assertTrue(f.add('http://example.org/'))
+            f.flush()
+        with URISeenFilter.open(path) as f:
+            self.assertIn('http://example.org/', f)
+            self.assertEqual(len(f), count + 1)
+
+    def test_invalid(self):
+        for capacity, error_rate in ((0, 0.01), (1, 0), (1, 1)):
+            with self.assertRaises(ValueError):
+                URISeenFilter(capacity, error_rate)
+        path = os.path.join(self.tmpdir, 'invalid')
+        with open(path, 'wb') as f:
+            f.write(b'\0' * 64)
+        with self.assertRaises(ValueError):
+            URISeenFilter.open(path)
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
+import ipaddress
 import unittest
 
-from urilib import urisplit
+from urilib import (FormParser, InternTable, querylist, urisplit,
+                    urisplit_many)
 
 
 class SplitTest(unittest.TestCase):
@@ -284,3 +286,205 @@ class SplitTest(unittest.TestCase):
         for uri in uris:
             with self.assertRaises(ValueError, msg='%r' % uri):
                 urisplit(uri).gethost()
+
+
+class FormParserTest(unittest.TestCase):
+
+    BODY = b'a=1&b=x+y%20z;&c&d=%E3%81%82&&e=&=f&g=%zz&h=%2'
+
+    def parse(self, chunks, **kwargs):
+        parser = FormParser(**kwargs)
+        items = []
+        for chunk in chunks:
+            items.extend(parser.feed(chunk))
+        items.extend(parser.close())
+        return items
+
+    def test_chunks(self):
+        expected = querylist(self.BODY)
+        self.assertEqual(self.parse([self.BODY]), expected)
+        # split the body at every possible position
+        for i in range(len(self.BODY) + 1):
+            chunks = [self.BODY[:i], self.BODY[i:]]
+            self.assertEqual(self.parse(chunks), expected, msg=chunks)
+        chunks = [self.BODY[i:i + 1] for i in range(len(self.BODY))]
+        self.assertEqual(self.parse(chunks), expected)
+        chunks = [bytearray(self.BODY[:5]), memoryview(self.BODY[5:])]
+        self.assertEqual(self.parse(chunks), expected)
+
+    def test_string(self):
+        body = self.BODY.decode('ascii')
+        expected = querylist(body)
+        chunks = [body[i:i + 3] for i in range(0, len(body), 3)]
+        self.assertEqual(self.parse(chunks), expected)
+
+    def test_feed(self):
+        parser = FormParser()
+        self.assertEqual(parser.feed(b'a=1&b'), [(b'a', b'1')])
+        self.assertEqual(parser.feed(b'=2'), [])
+        self.assertEqual(parser.feed(b'&'), [(b'b', b'2')])
+        self.assertEqual(parser.close(), [])
+        self.assertEqual(FormParser().close(), [])
+
+    def test_limits(self):
+        self.assertEqual(len(self.parse([b'a&b&c'], maxpairs=3)), 3)
+        with self.assertRaises(ValueError):
+            self.parse([b'a&b&c'], maxpairs=2)
+        with self.assertRaises(ValueError):
+            self.parse([b'a&b&', b'c'], maxpairs=2)
+        self.assertEqual(self.parse([b'abc=def'], maxfieldsize=3),
+                         [(b'abc', b'def')])
+        for chunks in ([b'abcd=e'], [b'a=bcde'], [b'ab', b'cd', b'=e'],
+                       [b'a=b', b'cd', b'e&']):
+            with self.assertRaises(ValueError, msg=chunks):
+                self.parse(chunks, maxfieldsize=3)
+        # incomplete fields are checked before the body is complete
+        parser = FormParser(maxfieldsize=3)
+        parser.feed(b'a=bc')
+        parser.feed(b'd')
+        with self.assertRaises(ValueError):
+            parser.feed(b'e')
+
+
+class SplitResultReplaceTest(unittest.TestCase):
+
+    def test_with_query(self):
+        uri = urisplit('http://example.com/p?a=1;utm=2&b=%7e&c&b=3#f')
+        cases = [
+            (dict(), 'http://example.com/p?a=1;utm=2&b=%7e&c&b=3#f'),
+            (dict(remove=['utm']), 'http://example.com/p?a=1&b=%7e&c&b=3#f'),
+            (dict(remove=['a']), 'http://example.com/p?utm=2&b=%7e&c&b=3#f'),
+            (dict(remove=['x']),
+             'http://example.com/p?a=1;utm=2&b=%7e&c&b=3#f'),
+            (dict(remove=['a', 'b', 'c', 'utm']), 'http://example.com/p#f'),
+            (dict(set={'b': 'x y'}),
+             'http://example.com/p?a=1;utm=2&b=x+y&c#f'),
+            (dict(set=[('d', 4)]),
+             'http://example.com/p?a=1;utm=2&b=%7e&c&b=3&d=4#f'),
+            (dict(add=[('b', 'a&b'), ('e', None)]),
+             'http://example.com/p?a=1;utm=2&b=%7e&c&b=3&b=a%26b&e#f'),
+            (dict(add={'a': 'x'}, set={'a': None}, remove=['b']),
+             'http://example.com/p?a;utm=2&c&a=x#f'),
+        ]
+        for kwargs, expected in cases:
+            self.assertEqual(uri.with_query(**kwargs).geturi(), expected,
+                             msg=kwargs)
+        uri = urisplit('http://example.com/?%C3%A4=1&x=2')
+        self.assertEqual(uri.with_query(set={'ä': 'ö'}).geturi(),
+                         'http://example.com/?%C3%A4=%C3%B6&x=2')
+        uri = urisplit('http://example.com/')
+        self.assertEqual(uri.with_query(remove=['a']).geturi(),
+                         'http://example.com/')
+        self.assertEqual(uri.with_query(add=[('a', 1)]).geturi(),
+                         'http://example.com/?a=1')
+
+    def test_with_query_separators(self):
+        # empty terms are dropped in all modes
+        cases = [
+            ('http://x/?', dict(add=[('a', 1)]), 'http://x/?a=1'),
+            ('http://x/?', dict(), 'http://x/'),
+            ('http://x/?&', dict(set={'a': 1}), 'http://x/?a=1'),
+            ('http://x/?&a=1', dict(add=[('b', 2)]), 'http://x/?a=1&b=2'),
+            ('http://x/?&a=1', dict(remove=['b']), 'http://x/?a=1'),
+            ('http://x/?a=1&', dict(add=[('b', 2)]), 'http://x/?a=1&b=2'),
+            ('http://x/?a=1;', dict(add=[('b', 2)]), 'http://x/?a=1&b=2'),
+            ('http://x/?a=1&', dict(), 'http://x/?a=1'),
+            ('http://x/?a=1&&b=2', dict(), 'http://x/?a=1&b=2'),
+            ('http://x/?a=1&&b=2', dict(remove=['b']), 'http://x/?a=1'),
+            ('http://x/?a=1;;b=2', dict(set={'a': 3}), 'http://x/?a=3;b=2'),
+            ('http://x/?a=1&c=3&', dict(remove=['c'], add=[('b', 2)]),
+             'http://x/?a=1&b=2'),
+            ('http://x/?c=3;a=1', dict(remove=['c']), 'http://x/?a=1'),
+            ('http://x/?&&', dict(remove=['a']), 'http://x/'),
+        ]
+        for uri, kwargs, expected in cases:
+            self.assertEqual(urisplit(uri).with_query(**kwargs).geturi(),
+                             expected, msg=(uri, kwargs))
+
+    def test_with_query_bytes(self):
+        uri = urisplit(b'http://example.com/?a=1&b=2')
+        self.assertEqual(uri.with_query(set={'a': 'ä'}, remove=[b'b'],
+                                        add=[(b'c', 3)]).geturi(),
+                         b'http://example.com/?a=%C3%A4&c=3')
+
+    def test_with_path(self):
+        uri = urisplit('http://example.com/a?q#f')
+        self.assertEqual(uri.with_path('/b c/ä').geturi(),
+                         'http://example.com/b%20c/%C3%A4?q#f')
+        self.assertEqual(uri.with_path('').geturi(), 'http://example.com?q#f')
+        self.assertEqual(urisplit(b'foo:bar').with_path('baz').geturi(),
+                         b'foo:baz')
+        # RFC 3986 4.2: a colon in the first segment of a relative path
+        self.assertEqual(urisplit('foo').with_path('a:b').geturi(), '/a:b')
+        self.assertEqual(urisplit('?q').with_path('a:b/c').geturi(),
+                         '/a:b/c?q')
+        self.assertEqual(urisplit('x').with_path('a/b:c').geturi(), 'a/b:c')
+        self.assertEqual(urisplit('foo:x').with_path('a:b').geturi(),
+                         'foo:a:b')
+        with self.assertRaises(ValueError):
+            uri.with_path('b')
+        with self.assertRaises(ValueError):
+            urisplit('foo:bar').with_path('//baz')
+
+    def test_with_host(self):
+        uri = urisplit('http://user@example.com:8080/a?q#f')
+        cases = [
+            ('example.org', 'http://user@example.org:8080/a?q#f'),
+            ('Bücher.de', 'http://user@xn--bcher-kva.de:8080/a?q#f'),
+            ('::1', 'http://user@[::1]:8080/a?q#f'),
+            (ipaddress.IPv4Address('127.0.0.1'),
+             'http://user@127.0.0.1:8080/a?q#f'),
+            ('', 'http://user@:8080/a?q#f'),
+        ]
+        for host, expected in cases:
+            self.assertEqual(uri.with_host(host).geturi(), expected)
+        self.assertEqual(urisplit('/a').with_host('example.com').geturi(),
+                         '//example.com/a')
+        self.assertEqual(urisplit(b'http://a/').with_host('b').geturi(),
+                         b'http://b/')
+        with self.assertRaises(ValueError):
+            urisplit('foo:bar').with_host('example.com')
+
+
+class InternTableTest(unittest.TestCase):
+
+    def test_intern(self):
+        table = InternTable()
+        uris = urisplit_many([
+            'http://example.com/a?q#f',
+            ''.join(['http', '://example.com', '/a?q#f']),
+            'foo:bar',
+        ], intern=table)
+        self.assertEqual(uris, urisplit_many([
+            'http://example.com/a?q#f',
+            'http://example.com/a?q#f',
+            'foo:bar',
+        ]))
+        self.assertIs(uris[0].scheme, uris[1].scheme)
+        self.assertIs(uris[0].authority, uris[1].authority)
+        self.assertIsNot(uris[0].path, uris[1].path)
+        self.assertIsNone(uris[2].authority)
+        self.assertEqual(len(table), 3)
+
+    def test_intern_paths(self):
+        table = InternTable(paths=True)
+        a = urisplit(b'http://example.com/a', table)
+        b = urisplit(b''.join([b'ftp://', b'example.com', b'/a']), table)
+        self.assertIs(a.authority, b.authority)
+        self.assertIs(a.path, b.path)
+        self.assertEqual(b, (b'ftp', b'example.com', b'/a', None, None))
+
+    def test_eviction(self):
+        table = InternTable(maxsize=2)
+        a = table.intern(''.join(['a', 'b']))
+        table.intern('c')
+        self.assertIs(table.intern('ab'), a)
+        table.intern('d')  # evicts 'c'
+        self.assertEqual(len(table), 2)
+        self.assertIs(table.intern(''.join(['a', 'b'])), a)
+        c = ''.join(['c', ''])
+        self.assertIs(table.intern(c), c)
+        table.clear()
+        self.assertEqual(len(table), 0)
+        with self.assertRaises(ValueError):
+            InternTable(maxsize=0)
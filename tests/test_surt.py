@@ -0,0 +1,29 @@
+import unittest
+
+from urilib import urisurt, urisurt_many
+
+
+class SurtTest(unittest.TestCase):
+
+    def test_urisurt(self):
+        cases = [
+            ('http://www.example.com/path?q', 'com,example,www)/path?q'),
+            ('http://www.Example.COM./path?q#frag', 'com,example,www)/path?q'),
+            ('https://user@example.com:8443/a/../b', 'com,example:8443)/b'),
+            ('http://example.com:80', 'com,example)/'),
+            ('http://127.0.0.1/x', '127.0.0.1)/x'),
+            ('http://[::1]:81/', '[::1]:81)/'),
+            ('mailto:me@example.com', 'mailto:me@example.com'),
+            (b'http://www.example.com/p?a=b', b'com,example,www)/p?a=b'),
+        ]
+        for uri, key in cases:
+            self.assertEqual(urisurt(uri), key, msg='uri=%r' % uri)
+
+    def test_sort(self):
+        uris = ['http://b.example.com/', 'http://example.org/',
+                'http://a.example.com/x', 'http://example.com/']
+        keys = sorted(urisurt_many(uris))
+        self.assertEqual(keys, [
+            'com,example)/', 'com,example,a)/x', 'com,example,b)/',
+            'org,example)/'
+        ])
@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from urilib import URISet, urinormalize
+
+
+class URISetTest(unittest.TestCase):
+
+    URIS = ['http://example.com/docs/%d' % i for i in range(100)] + [
+        'http://Example.com/a', 'http://example.com/b?q',
+        'https://example.com/', 'http://example.com/docs',
+        'http://example.org/', 'urn:example', 'http://example.com/a',
+    ]
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def check(self, uriset):
+        expected = sorted(set(map(urinormalize, self.URIS)))
+        self.assertEqual(len(uriset), len(expected))
+        self.assertEqual(list(uriset), expected)
+        for uri in self.URIS:
+            self.assertIn(uri, uriset)
+        for uri in ('http://example.com/', 'http://example.com/docs/100',
+                    'http://example.com/docs/', 'http://example.net/',
+                    'a:b', 'zzz:'):
+            self.assertNotIn(uri, uriset)
+        self.assertEqual(list(uriset.prefix('http://example.com/docs/')),
+                         [uri for uri in expected
+                          if uri.startswith('http://example.com/docs/')])
+        self.assertEqual(list(uriset.prefix('http://example.com/docs/1')),
+                         ['http://example.com/docs/1'] +
+                         ['http://example.com/docs/1%d' % i
+                          for i in range(10)])
+        self.assertEqual(list(uriset.prefix('https:')),
+                         ['https://example.com/'])
+        self.assertEqual(list(uriset.prefix('zzz')), [])
+
+    def test_blocksize(self):
+        for blocksize in (1, 2, 16, 1000):
+            self.check(URISet(self.URIS, blocksize))
+        with self.assertRaises(ValueError):
+            URISet(self.URIS, 0)
+
+    def test_empty(self):
+        uriset = URISet()
+        self.assertEqual(len(uriset), 0)
+        self.assertEqual(list(uriset), [])
+        self.assertNotIn('http://example.com/', uriset)
+        self.assertEqual(list(uriset.prefix('')), [])
+
+    def test_save_load(self):
+        path = os.path.join(self.tmpdir, 'uris')
+        URISet(self.URIS).save(path)
+        with URISet.load(path) as uriset:
+            self.check(uriset)
+        with open(path, 'wb') as f:
+            f.write(b'invalid')
+        with self.assertRaises(ValueError):
+            URISet.load(path)
+
+    def test_bytes(self):
+        uris = [uri.encode('utf-8') for uri in self.URIS]
+        uriset = URISet(uris)
+        expected = sorted(set(map(urinormalize, uris)))
+        self.assertEqual(list(uriset), expected)
+        self.assertEqual(list(uriset.prefix(b'https:')),
+                         [b'https://example.com/'])
+        path = os.path.join(self.tmpdir, 'uris')
+        uriset.save(path)
+        with URISet.load(path) as uriset:
+            self.assertEqual(list(uriset), expected)
+        with self.assertRaises(TypeError):
+            URISet(['http://example.com/', b'http://example.org/'])
+
+    def test_close_big_endian(self):
+        path = os.path.join(self.tmpdir, 'uris')
+        URISet(self.URIS).save(path)
+        with mock.patch('urilib.uriset.sys') as sys:
+            sys.byteorder = 'big'
+            uriset = URISet.load(path)
+        uriset.close()
+        uriset.close()
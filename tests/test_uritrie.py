@@ -0,0 +1,78 @@
+import unittest
+
+from urilib import URITrie
+
+
+class URITrieTest(unittest.TestCase):
+
+    PREFIXES = {
+        'http://example.com/': 'root',
+        'http://example.com/docs/': 'docs',
+        'http://example.com/docs/api': 'api',
+        'http://example.com:8080/': 'port',
+        'https://example.com/': 'https',
+        'http://*.example.com/': 'sub',
+        'http://*.a.example.com/x': 'subx',
+        'http://www.example.com/private': 'private',
+        'http://127.0.0.1/': 'ip',
+        'urn:isbn': 'isbn',
+    }
+
+    def test_longest_prefix(self):
+        trie = URITrie(self.PREFIXES)
+        cases = [
+            ('http://example.com', 'root'),
+            ('http://Example.COM:80/foo', 'root'),
+            ('http://example.com/docs', 'docs'),
+            ('http://example.com/docs/', 'docs'),
+            ('http://example.com/docs/guide/x.html', 'docs'),
+            ('http://example.com/docs/api/v1', 'api'),
+            ('http://example.com/docs/apis', 'docs'),
+            ('http://example.com/docs/./api/../api', 'api'),
+            ('http://example.com/documents', 'root'),
+            ('http://example.com:8080/docs/', 'port'),
+            ('https://example.com/docs/', 'https'),
+            ('http://www.example.com/', 'sub'),
+            ('http://www.example.com/private/x', 'private'),
+            ('http://b.a.example.com/x/y', 'subx'),
+            ('http://b.a.example.com/y', 'sub'),
+            ('http://127.0.0.1/x', 'ip'),
+            ('urn:isbn:123', None),
+            ('urn:isbn', 'isbn'),
+            ('http://example.org/', None),
+            ('ftp://example.com/', None),
+            ('http://example.com:81/', None),
+        ]
+        for uri, value in cases:
+            self.assertEqual(trie.longest_prefix(uri), value,
+                             msg='uri=%r' % uri)
+        self.assertEqual(trie.longest_prefix_many([c[0] for c in cases]),
+                         [c[1] for c in cases])
+        self.assertEqual(trie.longest_prefix('ftp://x/', 'none'), 'none')
+
+    def test_mapping(self):
+        trie = URITrie()
+        self.assertEqual(len(trie), 0)
+        trie.update(self.PREFIXES.items())
+        self.assertEqual(len(trie), len(self.PREFIXES))
+        self.assertEqual(trie['http://example.com/docs'], 'docs')
+        self.assertIn('http://example.com:8080', trie)
+        self.assertNotIn('http://example.com/docs/guide', trie)
+        self.assertNotIn('http://www.example.com/', trie)
+        with self.assertRaises(KeyError):
+            trie['http://example.org/']
+        trie['http://example.com/docs'] = 'new'
+        self.assertEqual(len(trie), len(self.PREFIXES))
+        self.assertEqual(trie.longest_prefix('http://example.com/docs/x'),
+                         'new')
+
+    def test_encoded_slash(self):
+        trie = URITrie({'http://example.com/a%2Fb': 1,
+                        'http://example.com/%C3%A4/c': 2})
+        self.assertIsNone(trie.longest_prefix('http://example.com/a/b'))
+        self.assertEqual(trie.longest_prefix('http://example.com/a%2fb/c'), 1)
+        self.assertEqual(trie.longest_prefix('http://example.com/\xe4/c/d'),
+                         2)
+        self.assertEqual(trie.longest_prefix('http://example.com/x/../a%2Fb'),
+                         1)
+        self.assertNotIn('http://example.com/a/b', trie)
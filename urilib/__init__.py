@@ -7,15 +7,30 @@ commonly used functions of the Python 2.7 Standard Library
 
 """
 
+from .blocklist import DomainBlocklist
+from .cache import URICache
 from .chars import GEN_DELIMS, RESERVED, SUB_DELIMS, UNRESERVED
-from .compose import uricompose
+from .compose import formencode, uricompose, uricompose_many
+from .dedup import uridedup
 from .defrag import DefragResult, uridefrag
-from .encoding import (idndecode, idnencode, uriencode, uriencode_plus,
-                       uridecode, uridecode_plus, uridecode_safe,
-                       uridecode_safe_plus)
+from .encoding import (idndecode, idndecode_many, idnencode, idnencode_many,
+                       pctnormalize, uriencode, uriencode_plus, uridecode,
+                       uridecode_plus, uridecode_safe, uridecode_safe_plus)
+from .fingerprint import urifingerprint, urifingerprint_many
 from .join import urijoin
-from .normalize import urinormalize
-from .split import SplitResult, querylist, urisplit, uriunsplit
+from .matcher import URIMatcher
+from .normalize import (NormalizationPolicy, uriequivalent, uriequivalent_many,
+                        urinormalize)
+from .packed import SplitResultArray, uridecode_safe_packed, urisplit_packed
+from .publicsuffix import (PublicSuffixList, getpublicsuffix,
+                           getregistrabledomain, getregistrabledomains)
+from .relativize import URIRelativizer, urirelativize
+from .seenfilter import URISeenFilter
+from .split import (FormParser, InternTable, SplitResult, querylist, urisplit,
+                    urisplit_many, uriunsplit)
+from .surt import urisurt, urisurt_many
+from .uriset import URISet
+from .uritrie import URITrie
 
 __all__ = (
     'GEN_DELIMS',
@@ -23,20 +38,51 @@ __all__ = (
     'SUB_DELIMS',
     'UNRESERVED',
     'DefragResult',
+    'DomainBlocklist',
+    'FormParser',
+    'InternTable',
+    'NormalizationPolicy',
+    'PublicSuffixList',
     'SplitResult',
+    'SplitResultArray',
+    'URICache',
+    'URIMatcher',
+    'URIRelativizer',
+    'URISeenFilter',
+    'URISet',
+    'URITrie',
     'uricompose',
+    'uricompose_many',
+    'formencode',
+    'getpublicsuffix',
+    'getregistrabledomain',
+    'getregistrabledomains',
     'idndecode',
+    'idndecode_many',
     'idnencode',
+    'idnencode_many',
+    'pctnormalize',
     'querylist',
     'uriencode',
+    'uriequivalent',
+    'uriequivalent_many',
     'uriencode_plus',
     'uridecode',
     'uridecode_safe',
+    'uridedup',
+    'uridecode_safe_packed',
     'uridecode_safe_plus',
     'uridefrag',
+    'urifingerprint',
+    'urifingerprint_many',
     'urijoin',
     'urinormalize',
+    'urirelativize',
     'urisplit',
+    'urisplit_many',
+    'urisplit_packed',
+    'urisurt',
+    'urisurt_many',
     'uriunsplit'
 )
 
@@ -0,0 +1,231 @@
+import array
+import ipaddress
+import mmap
+import struct
+import sys
+
+from .encoding import idndecode
+from .split import urisplit
+
+# magic, number of entries, table size
+_HEADER = struct.Struct('<8sQQ')
+
+_MAGIC = b'URIBLK01'
+
+# 64-bit FNV-1a parameters
+_FNV_OFFSET = 0xcbf29ce484222325
+_FNV_PRIME = 0x100000001b3
+_MASK = 0xffffffffffffffff
+
+_DOT = ord('.')
+
+# minimum hash table size, must be a power of two
+_MINSIZE = 1024
+
+
+def _key(domain):
+    # hash the domain from right to left, so that the hashes of all
+    # suffixes are computed in a single pass during lookups
+    h = _FNV_OFFSET
+    for c in reversed(domain):
+        h = ((h ^ c) * _FNV_PRIME) & _MASK
+    return h or 1  # zero marks empty slots
+
+
+def _entry(domain):
+    if isinstance(domain, bytes):
+        domain = domain.decode('utf-8')
+    domain = domain.strip().lower().rstrip('.')
+    try:
+        # IP addresses are only matched exactly
+        return ipaddress.ip_address(domain.strip('[]')).compressed.encode()
+    except ValueError:
+        pass
+    if domain.startswith('*.'):
+        domain = domain[1:]
+    # suffix entries keep their leading dot
+    dot = '.' if domain.startswith('.') else ''
+    domain = domain.lstrip('.')
+    if not domain:
+        return None
+    return (dot + _domain(domain)).encode('utf-8')
+
+
+def _domain(domain):
+    # normalize domains like SplitResult.gethost()
+    try:
+        return idndecode(domain.lower()).lower()
+    except ValueError:
+        return domain
+
+
+class DomainBlocklist(object):
+    """Set of blocked domain names and domain suffixes, stored in a
+    compact hash table that can be saved to and memory-mapped from a
+    file.
+
+    """
+
+    def __init__(self, domains=()):
+        self._setup(0, array.array('Q', [0]) * _MINSIZE, None)
+        for domain in domains:
+            domain = _entry(domain)
+            if domain is not None:
+                self._insert(_key(domain))
+
+    def _setup(self, count, table, mm):
+        self._count = count
+        self._table = table
+        self._mask = len(table) - 1
+        self._mmap = mm
+
+    @classmethod
+    def load(cls, path):
+        """Load a blocklist written by :meth:`save` from a
+        memory-mapped file.
+
+        """
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, count, size = _HEADER.unpack_from(mm)
+            if magic != _MAGIC or size & (size - 1) or count >= size:
+                raise ValueError('Invalid blocklist file')
+            start = _HEADER.size
+            end = start + 8 * size
+            if len(mm) != end:
+                raise ValueError('Invalid blocklist file')
+            if sys.byteorder == 'little':
+                table = memoryview(mm)[start:end].cast('Q')
+            else:
+                table = array.array('Q', mm[start:end])
+                table.byteswap()
+        except (TypeError, ValueError, struct.error):
+            mm.close()
+            raise ValueError('Invalid blocklist file')
+        result = cls.__new__(cls)
+        result._setup(count, table, mm)
+        return result
+
+    def save(self, path):
+        """Write the blocklist to a file that can be loaded by
+        :meth:`load`.
+
+        """
+        table = array.array('Q', self._table)
+        if sys.byteorder != 'little':
+            table.byteswap()
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, self._count, len(table)))
+            f.write(table.tobytes())
+
+    def close(self):
+        """Close the memory-mapped file of a loaded blocklist, if
+        any.
+
+        """
+        if self._mmap is not None:
+            if isinstance(self._table, memoryview):
+                self._table.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, host):
+        if isinstance(host, bytes):
+            host = host.decode('utf-8', 'replace')
+        if isinstance(host, str):
+            try:
+                host = ipaddress.ip_address(host.strip('[]'))
+            except ValueError:
+                host = _domain(host)
+        return self._lookup(host)
+
+    def match(self, uri):
+        """Return whether the host of `uri` is blocked."""
+        return self._lookup(urisplit(uri).gethost())
+
+    def match_many(self, uris):
+        """Return a list of booleans indicating whether the hosts of
+        `uris` are blocked.
+
+        """
+        lookup = self._lookup
+        return [lookup(urisplit(uri).gethost()) for uri in uris]
+
+    def _lookup(self, host):
+        # look up a host as returned by SplitResult.gethost()
+        if host is None:
+            return False
+        elif isinstance(host, bytes):
+            host = host.lower()
+        elif isinstance(host, str):
+            host = host.lower().encode('utf-8')
+        else:
+            return self._find(_key(host.compressed.encode()))
+        if host.endswith(b'.'):
+            host = host[:-1]
+        find = self._find
+        h = _FNV_OFFSET
+        for c in reversed(host):
+            if c == _DOT:
+                # check the suffix before and after the dot, to match
+                # both "example.com" and "*.example.com" entries
+                if find(h or 1):
+                    return True
+                h = ((h ^ c) * _FNV_PRIME) & _MASK
+                if find(h or 1):
+                    return True
+            else:
+                h = ((h ^ c) * _FNV_PRIME) & _MASK
+        return find(h or 1)
+
+    def _find(self, key):
+        table = self._table
+        mask = self._mask
+        i = key & mask
+        while True:
+            value = table[i]
+            if value == key:
+                return True
+            elif value == 0:
+                return False
+            i = (i + 1) & mask
+
+    def _insert(self, key):
+        table = self._table
+        mask = self._mask
+        i = key & mask
+        while True:
+            value = table[i]
+            if value == key:
+                return
+            elif value == 0:
+                break
+            i = (i + 1) & mask
+        table[i] = key
+        self._count += 1
+        # keep the load factor below one half
+        if 2 * self._count > len(table):
+            self._resize(2 * len(table))
+
+    def _resize(self, size):
+        old = self._table
+        table = array.array('Q', [0]) * size
+        mask = size - 1
+        for key in old:
+            if key:
+                i = key & mask
+                while table[i]:
+                    i = (i + 1) & mask
+                table[i] = key
+        self._table = table
+        self._mask = mask
@@ -0,0 +1,183 @@
+from .join import urijoin
+from .normalize import urinormalize
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    kind INTEGER NOT NULL,
+    key NOT NULL,
+    value NOT NULL,
+    used INTEGER NOT NULL,
+    UNIQUE (kind, key)
+);
+CREATE INDEX IF NOT EXISTS cache_used ON cache (used);
+"""
+
+# cached functions
+_NORMALIZE = 0
+_JOIN = 1
+_JOIN_STRICT = 2
+
+# number of changes written in a single transaction
+_BATCHSIZE = 1000
+
+
+def _joinkey(base, ref):
+    # prefix the base with its length so that keys are unambiguous
+    if isinstance(base, bytes):
+        return b'%d:' % len(base) + base + ref
+    else:
+        return '%d:' % len(base) + base + ref
+
+
+class URICache(object):
+    """Persistent cache of :func:`urinormalize` and :func:`urijoin`
+    results, stored in an SQLite database file holding at most
+    `maxsize` entries.
+
+    """
+
+    def __init__(self, path, maxsize=1000000, timeout=30.0):
+        # imported here, since Python may be built without sqlite3 and
+        # importing it slows down importing this package
+        import sqlite3
+
+        if maxsize < 1:
+            raise ValueError('Invalid cache size')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._db = sqlite3.connect(path, timeout=timeout,
+                                   isolation_level=None)
+        # write-ahead logging lets readers proceed while a process writes
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(_SCHEMA)
+        used, count = self._db.execute(
+            'SELECT COALESCE(MAX(used), 0), COUNT(*) FROM cache'
+        ).fetchone()
+        self._clock = used
+        self._count = count
+        self._pending = {}
+        self._touched = {}
+
+    @property
+    def hitrate(self):
+        """The fraction of lookups answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def normalize(self, uri):
+        """Return the cached result of :func:`urinormalize` for `uri`."""
+        if isinstance(uri, (bytearray, memoryview)):
+            uri = bytes(uri)
+        value = self._get(_NORMALIZE, uri)
+        if value is None:
+            value = urinormalize(uri)
+            self._put(_NORMALIZE, uri, value)
+        return value
+
+    def normalize_many(self, uris):
+        """Return a list of the cached normalized forms of all `uris`."""
+        return [self.normalize(uri) for uri in uris]
+
+    def join(self, base, ref, strict=False):
+        """Return the cached result of :func:`urijoin` for `base` and
+        `ref`.
+
+        """
+        kind = _JOIN_STRICT if strict else _JOIN
+        key = _joinkey(base, ref)
+        value = self._get(kind, key)
+        if value is None:
+            value = urijoin(base, ref, strict)
+            self._put(kind, key, value)
+        return value
+
+    def flush(self):
+        """Write pending entries and access times to the database, and
+        evict the least recently used entries if the cache is full.
+
+        """
+        if not self._pending and not self._touched:
+            return
+        db = self._db
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            db.executemany(
+                'INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)',
+                [(kind, key, value, used)
+                 for (kind, key), (value, used) in self._pending.items()]
+            )
+            db.executemany(
+                'UPDATE cache SET used = ? WHERE kind = ? AND key = ?',
+                [(used, kind, key)
+                 for (kind, key), used in self._touched.items()]
+            )
+            self._count += len(self._pending)
+            if self._count > self.maxsize:
+                # other processes may have added entries, too
+                self._count = db.execute(
+                    'SELECT COUNT(*) FROM cache'
+                ).fetchone()[0]
+            if self._count > self.maxsize:
+                # evict down to 90% of the maximum size, so that
+                # evictions are not needed on every flush
+                excess = self._count - self.maxsize * 9 // 10
+                db.execute(
+                    'DELETE FROM cache WHERE rowid IN '
+                    '(SELECT rowid FROM cache ORDER BY used LIMIT ?)',
+                    (excess,)
+                )
+                self._count -= excess
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        else:
+            db.execute('COMMIT')
+        self._pending = {}
+        self._touched = {}
+
+    def close(self):
+        """Flush pending changes and close the database."""
+        if self._db is not None:
+            self.flush()
+            self._db.close()
+            self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        self.flush()
+        return self._db.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+    def _get(self, kind, key):
+        self._clock += 1
+        try:
+            value, _ = self._pending[(kind, key)]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            self._pending[(kind, key)] = (value, self._clock)
+            return value
+        row = self._db.execute(
+            'SELECT value FROM cache WHERE kind = ? AND key = ?', (kind, key)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        # access times are written in batches to avoid a write per hit
+        self._touched[(kind, key)] = self._clock
+        if len(self._touched) >= _BATCHSIZE:
+            self.flush()
+        return row[0]
+
+    def _put(self, kind, key, value):
+        self._pending[(kind, key)] = (value, self._clock)
+        if len(self._pending) >= _BATCHSIZE:
+            self.flush()
@@ -2,130 +2,331 @@ import ipaddress
 import numbers
 import re
 
-from collections import Iterable, Mapping
+try:
+    from collections.abc import Iterable, Mapping
+except ImportError:
+    from collections import Iterable, Mapping
 
 from .chars import SUB_DELIMS
-from .encoding import uriencode, uriencode_plus, idnencode
+from .encoding import _plusencoder, uriencode, uriencode_plus, idnencode
 from .split import uriunsplit
 
-# RFC 3986 3.1: scheme = ALPHA *( ALPHA / DIGIT / "+" / "-" / "." )
-_SCHEME_RE = re.compile(r"\A[A-Za-z][A-Za-z0-9+.-]*\Z")
+_BYTES_TYPES = (bytes, bytearray, memoryview)
 
-# RFC 3986 3.2: authority = [ userinfo "@" ] host [ ":" port ]
-_AUTHORITY_RE_STRING = re.compile(r"\A(?:(.*)@)?(.*?)(?::([0-9]*))?\Z")
 
-def _scheme(scheme):
+class _String(object):
+
+    TYPE = str
+
+    # RFC 3986 3.1: scheme = ALPHA *( ALPHA / DIGIT / "+" / "-" / "." )
+    SCHEME_RE = re.compile(r"\A[A-Za-z][A-Za-z0-9+.-]*\Z")
+
+    # RFC 3986 3.2: authority = [ userinfo "@" ] host [ ":" port ]
+    AUTHORITY_RE = re.compile(r"\A(?:(.*)@)?(.*?)(?::([0-9]*))?\Z")
+
+    COLON, SLASH, LBRACKET, RBRACKET, AT = ':/[]@'
+
+    EMPTY, EQ, AMP = '', '=', '&'
+
+    DIGITS = '0123456789'
+
+    @staticmethod
+    def native(value, encoding):
+        return value
+
+    @staticmethod
+    def ascii(value):
+        return value
+
+
+class _Bytes(object):
+
+    TYPE = bytes
+
+    # RFC 3986 3.1: scheme = ALPHA *( ALPHA / DIGIT / "+" / "-" / "." )
+    SCHEME_RE = re.compile(br"\A[A-Za-z][A-Za-z0-9+.-]*\Z")
+
+    # RFC 3986 3.2: authority = [ userinfo "@" ] host [ ":" port ]
+    AUTHORITY_RE = re.compile(br"\A(?:(.*)@)?(.*?)(?::([0-9]*))?\Z")
+
+    COLON, SLASH, LBRACKET, RBRACKET, AT = (b':', b'/', b'[', b']', b'@')
+
+    EMPTY, EQ, AMP = b'', b'=', b'&'
+
+    DIGITS = b'0123456789'
+
+    @staticmethod
+    def native(value, encoding):
+        if isinstance(value, str):
+            return value.encode(encoding)
+        elif isinstance(value, (bytearray, memoryview)):
+            return bytes(value)
+        else:
+            return value
+
+    @staticmethod
+    def ascii(value):
+        return value.encode('ascii')
+
+
+def _scheme(scheme, t):
     if not scheme:
         return None
-    if _SCHEME_RE.match(scheme):
+    if t.SCHEME_RE.match(scheme):
         return scheme.lower()
     else:
         raise ValueError('Invalid scheme component')
 
 
-def _authority(userinfo, host, port, encoding):
+def _authority(userinfo, host, port, encoding, t):
     authority = []
 
     if userinfo is not None:
+        userinfo = t.native(userinfo, encoding)
         authority.append(uriencode(userinfo, ':', encoding))
-        authority.append('@')
+        authority.append(t.AT)
 
-    if host is not None and host != '':
+    host = t.native(host, encoding)
+    if host is not None and host != t.EMPTY:
         if isinstance(host, ipaddress.IPv6Address):
-            if isinstance('', bytes):
-                iphost = host.compressed.encode('ascii')
-            else:
-                iphost = host.compressed
-            authority.append('[' + iphost + ']')
+            iphost = t.ascii(host.compressed)
+            authority.append(t.LBRACKET + iphost + t.RBRACKET)
         elif isinstance(host, ipaddress.IPv4Address):
-            if isinstance('', bytes):
-                iphost = host.compressed.encode('ascii')
-            else:
-                iphost = host.compressed
-            authority.append(iphost)
+            authority.append(t.ascii(host.compressed))
         else:
-            authority.append(_host(host))
+            authority.append(_host(host, t))
 
+    port = t.native(port, encoding)
     if isinstance(port, numbers.Number):
-        authority.append(_port(str(port)))
-    elif isinstance(port, type('')):
-        authority.append(_port(port))
+        authority.append(_port(t.ascii(str(port)), t))
+    elif isinstance(port, t.TYPE):
+        authority.append(_port(port, t))
 
-    return ''.join(authority) if authority else None
+    return t.EMPTY.join(authority) if authority else None
 
 
-def _ip_literal(address):
+def _ip_literal(address, t):
+    if isinstance(address, bytes):
+        address = address.decode('utf-8')
     if address.startswith('v'):
         raise ValueError('Address mechanism not supported')
     else:
-        if isinstance(address , bytes):
-            address = address.decode('utf-8')
-            iphost = ipaddress.IPv6Address(address).compressed.encode('ascii')
-        else:
-            iphost = ipaddress.IPv6Address(address).compressed
-        return '[' + iphost + ']'
+        iphost = ipaddress.IPv6Address(address).compressed
+        return t.ascii('[' + iphost + ']')
 
 
-def _host(host):
+def _host(host, t):
     # RFC 3986 3.2.3: Although host is case-insensitive, producers and
     # normalizers should use lowercase for registered names and
     # hexadecimal addresses for the sake of uniformity, while only
     # using uppercase letters for percent-encodings.
-    if host.startswith('[') and host.endswith(']'):
-        return _ip_literal(host[1:-1])
+    if host.startswith(t.LBRACKET) and host.endswith(t.RBRACKET):
+        return _ip_literal(host[1:-1], t)
     # check for IPv6 addresses as returned by SplitResult.gethost()
     try:
-        return _ip_literal(host)
+        return _ip_literal(host, t)
     except ValueError:
         return idnencode(host)
 
 
-def _port(port):
+def _port(port, t):
     # RFC 3986 3.2.3: URI producers and normalizers should omit the
     # port component and its ":" delimiter if port is empty or if its
     # value would be the same as that of the scheme's default.
-    if port.lstrip('0123456789'):
+    if port.lstrip(t.DIGITS):
         raise ValueError('Invalid port subcomponent')
     elif port:
-        return ':' + port
+        return t.COLON + port
     else:
-        return ''
+        return t.EMPTY
 
 
-def _querylist(items, encoding='utf-8', safe=''):
+def _querylist(items, encoding='utf-8', safe='', t=_String, memo=None):
     if len(items) == 0:
         return None
     terms = []
     append = terms.append
     for key, value in items:
-        name = uriencode_plus(key, safe, encoding)
-        if value is None:
-            append(name)
+        if memo is None:
+            append(_queryterm(key, value, encoding, safe, t))
         else:
-            if isinstance(value, numbers.Number):
-                value = str(value)
-            elif not isinstance(value, type('')):
-                value.encode(encoding)
-            append(name + '=' + uriencode_plus(value, safe, encoding))
-    return '&'.join(terms)
+            # types are part of the key, since 1 == 1.0 == True
+            append(_memo(memo, (t, type(key), key, type(value), value),
+                         _queryterm, key, value, encoding, safe, t))
+    return t.AMP.join(terms)
 
 
-def _querydict(mapping, encoding='utf-8', safe=''):
-    items = []
+def _queryterm(key, value, encoding, safe, t):
+    name = uriencode_plus(t.native(key, encoding), safe, encoding)
+    if value is None:
+        return name
+    if isinstance(value, numbers.Number):
+        value = t.ascii(str(value))
+    else:
+        value = t.native(value, encoding)
+    return name + t.EQ + uriencode_plus(value, safe, encoding)
+
+
+def _querydict(mapping, encoding='utf-8', safe='', t=_String, memo=None):
+    items = list(_mappingitems(mapping))
+    return _querylist(items, encoding, safe, t, memo)
+
+
+def _mappingitems(mapping):
     for key, value in mapping.items():
-        if isinstance(value, type('')):
-            items.append((key, value))
+        if isinstance(value, (str,) + _BYTES_TYPES):
+            yield (key, value)
         elif isinstance(value, Iterable):
-            items.extend([(key, v) for v in value])
+            for v in value:
+                yield (key, v)
         else:
-            items.append((key, value))
-    return _querylist(items, encoding, safe)
+            yield (key, value)
+
+
+# size of chunks written to file-like objects by formencode()
+_CHUNKSIZE = 65536
+
+
+def _formbytes(value, encoding):
+    if isinstance(value, bytes):
+        return value
+    elif isinstance(value, (bytearray, memoryview)):
+        return bytes(value)
+    elif isinstance(value, numbers.Number):
+        return str(value).encode('ascii')
+    else:
+        return value.encode(encoding)
+
+
+def formencode(items, out=None, encoding='utf-8', safe=''):
+    """Encode a mapping or iterable of `(name, value)` pairs as an
+    ``application/x-www-form-urlencoded`` body, writing it to `out` if
+    given or returning it as a :class:`bytearray`.
+
+    """
+    if isinstance(items, Mapping):
+        items = _mappingitems(items)
+    if not isinstance(safe, bytes):
+        safe = safe.encode('ascii')
+    encode = _plusencoder(safe)
+    if isinstance(out, bytearray):
+        buf = out
+    else:
+        buf = bytearray()
+    extend = buf.extend
+    sep = b''
+    for name, value in items:
+        extend(sep)
+        extend(encode(_formbytes(name, encoding)))
+        if value is not None:
+            extend(b'=')
+            extend(encode(_formbytes(value, encoding)))
+        sep = b'&'
+        if out is not None and buf is not out and len(buf) >= _CHUNKSIZE:
+            out.write(buf)
+            buf = bytearray()
+            extend = buf.extend
+    if out is None:
+        return buf
+    elif buf is not out:
+        out.write(buf)
+    return out
 
 
 def uricompose(scheme=None, authority=None, path='', query=None,
                fragment=None, userinfo=None, host=None, port=None,
                encoding='utf-8'):
     """Compose a URI string from its individual components."""
+    return uriunsplit(_uricompose(scheme, authority, path, query, fragment,
+                                  userinfo, host, port, encoding))
+
+
+def uricompose_many(rows, encoding='utf-8', out=None):
+    """Compose URI strings from a sequence of mappings of
+    :func:`uricompose` keyword arguments, or from a mapping of
+    argument names to columns of values.
+
+    """
+    if isinstance(rows, Mapping):
+        names = list(rows)
+        columns = [rows[name] for name in names]
+        if len(set(map(len, columns))) > 1:
+            raise ValueError('Columns must have the same length')
+        rows = (dict(zip(names, values)) for values in zip(*columns))
+    if out is None:
+        out = []
+    if hasattr(out, 'write'):
+        write = out.write
+        emit = lambda uri: write(uri + (b'\n' if isinstance(uri, bytes)
+                                       else '\n'))
+    else:
+        emit = out.append
+
+    # components are encoded once per distinct value within a batch
+    heads, paths, queries, fragments, terms = {}, {}, {}, {}, {}
+
+    def compose(scheme=None, authority=None, path='', query=None,
+                fragment=None, userinfo=None, host=None, port=None):
+        t = _mode(scheme, authority, path, query, fragment, userinfo, host,
+                  port)
+        if isinstance(authority, (list, tuple)):
+            authority = tuple(authority)
+            key = (t, scheme, authority, tuple(map(type, authority)),
+                   userinfo, host, type(port), port)
+        else:
+            key = (t, scheme, authority, userinfo, host, type(port), port)
+        scheme, authority = _memo(heads, key, _head, scheme, authority,
+                                  userinfo, host, port, encoding, t)
+        key = (t, path, scheme is None, authority is None)
+        path = _memo(paths, key, _path, path, scheme, authority, encoding, t)
+        if isinstance(query, (str, bytes)):
+            query = _memo(queries, (t, query), _query, query, encoding, t)
+        else:
+            query = _query(query, encoding, t, terms)
+        fragment = _memo(fragments, (t, fragment), _fragment, fragment,
+                         encoding, t)
+        return uriunsplit((scheme, authority, path, query, fragment))
+
+    for row in rows:
+        emit(compose(**row))
+    return out
+
+
+def _memo(cache, key, func, *args):
+    try:
+        return cache[key]
+    except KeyError:
+        value = cache[key] = func(*args)
+        return value
+    except TypeError:  # unhashable
+        return func(*args)
+
+
+def _uricompose(scheme, authority, path, query, fragment, userinfo, host,
+                port, encoding):
+    t = _mode(scheme, authority, path, query, fragment, userinfo, host, port)
+    scheme, authority = _head(scheme, authority, userinfo, host, port,
+                              encoding, t)
+    path = _path(path, scheme, authority, encoding, t)
+    query = _query(query, encoding, t)
+    fragment = _fragment(fragment, encoding, t)
+    return scheme, authority, path, query, fragment
+
+
+def _mode(scheme, authority, path, query, fragment, userinfo, host, port):
+    # compose a bytes object if any component is bytes-like
+    values = [scheme, authority, path, query, fragment, userinfo, host, port]
+    if isinstance(authority, (list, tuple)):
+        values.extend(authority)
+    for value in values:
+        if isinstance(value, _BYTES_TYPES):
+            return _Bytes
+    return _String
+
+
+def _head(scheme, authority, userinfo, host, port, encoding, t):
+    scheme = t.native(scheme, encoding)
+    authority = t.native(authority, encoding)
 
     # RFC 3986 3.1: Scheme names consist of a sequence of characters
     # beginning with a letter and followed by any combination of
@@ -136,15 +337,13 @@ def uricompose(scheme=None, authority=None, path='', query=None,
     # letters as equivalent to lowercase in scheme names (e.g., allow
     # "HTTP" as well as "http") for the sake of robustness but should
     # only produce lowercase scheme names for consistency.
-    scheme = _scheme(scheme)
+    scheme = _scheme(scheme, t)
 
     # authority must be string type or three-item iterable
     if authority is None:
         authority = (None, None, None)
-    #elif isinstance(authority, bytes):
-    #    authority = _AUTHORITY_RE_BYTES.match(authority).groups()
-    elif isinstance(authority, type('')):
-        authority = _AUTHORITY_RE_STRING.match(authority).groups()
+    elif isinstance(authority, t.TYPE):
+        authority = t.AUTHORITY_RE.match(authority).groups()
     elif not isinstance(authority, Iterable):
         raise TypeError('Invalid authority type')
     elif len(authority) != 3:
@@ -153,26 +352,36 @@ def uricompose(scheme=None, authority=None, path='', query=None,
         userinfo if userinfo is not None else authority[0],
         host if host is not None else authority[1],
         port if port is not None else authority[2],
-        encoding
+        encoding, t
     )
+    return scheme, authority
+
+
+def _path(path, scheme, authority, encoding, t):
+    path = t.native(path, encoding)
 
     # RFC 3986 3.3: If a URI contains an authority component, then the
     # path component must either be empty or begin with a slash ("/")
     # character.  If a URI does not contain an authority component,
     # then the path cannot begin with two slash characters ("//").
     path = uriencode(path, '/:@+,', encoding)
-    if authority is not None and path and not path.startswith('/'):
+    if authority is not None and path and not path.startswith(t.SLASH):
         raise ValueError('Invalid path with authority component')
-    if authority is None and path.startswith('//'):
+    if authority is None and path.startswith(t.SLASH + t.SLASH):
         raise ValueError('Invalid path without authority component')
 
     # RFC 3986 4.2: A path segment that contains a colon character
     # (e.g., "this:that") cannot be used as the first segment of a
     # relative-path reference, as it would be mistaken for a scheme
     # name.
-    if scheme is None and authority is None and not path.startswith('/'):
-        if ':' in path.partition('/')[0]:
-            path = '/' + path
+    if scheme is None and authority is None and not path.startswith(t.SLASH):
+        if t.COLON in path.partition(t.SLASH)[0]:
+            path = t.SLASH + path
+    return path
+
+
+def _query(query, encoding, t, memo=None):
+    query = t.native(query, encoding)
 
     # RFC 3986 3.4: The characters slash ("/") and question mark ("?")
     # may represent data within the query component.  Beware that some
@@ -185,14 +394,19 @@ def uricompose(scheme=None, authority=None, path='', query=None,
     # pairs and one frequently used value is a reference to another
     # URI, it is sometimes better for usability to avoid percent-
     # encoding those characters.
-    if isinstance(query, type('')) and query:
+    if isinstance(query, t.TYPE) and query:
         query = uriencode_plus(query, '=&;@,', encoding)
     elif isinstance(query, Mapping):
-        query = _querydict(query, encoding)
+        query = _querydict(query, encoding, t=t, memo=memo)
     elif isinstance(query, Iterable):
-        query = _querylist(query, encoding)
+        query = _querylist(query, encoding, t=t, memo=memo)
     elif query is not None:
         raise TypeError('Invalid query type')
+    return query
+
+
+def _fragment(fragment, encoding, t):
+    fragment = t.native(fragment, encoding)
 
     # RFC 3986 3.5: The characters slash ("/") and question mark ("?")
     # are allowed to represent data within the fragment identifier.
@@ -202,4 +416,4 @@ def uricompose(scheme=None, authority=None, path='', query=None,
     if fragment is not None:
         fragment = uriencode_plus(fragment, '@,', encoding)
 
-    return uriunsplit((scheme, authority, path, query, fragment))
+    return fragment
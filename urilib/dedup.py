@@ -0,0 +1,142 @@
+import collections
+import heapq
+import itertools
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+
+from operator import itemgetter
+
+from .normalize import urinormalize
+
+# number of items pickled together in run files
+_BLOCKSIZE = 1024
+
+# maximum number of run files merged at once
+_MAXRUNS = 64
+
+# estimated memory used per item in addition to URI and key
+_OVERHEAD = 128
+
+_key = itemgetter(0)
+
+_missing = object()
+
+
+def _chunks(uris, maxmem):
+    chunk = []
+    size = 0
+    for uri in uris:
+        chunk.append(uri)
+        # assume the key is about as large as the URI itself
+        size += 2 * sys.getsizeof(uri) + _OVERHEAD
+        if size >= maxmem:
+            yield chunk
+            chunk = []
+            size = 0
+    if chunk:
+        yield chunk
+
+
+def _unique(items):
+    last = _missing
+    for item in items:
+        if item[0] != last:
+            last = item[0]
+            yield item
+
+
+def _sorted(uris, key):
+    items = [(key(uri), uri) for uri in uris]
+    items.sort(key=_key)  # stable, so first URI per key is kept
+    return _unique(items)
+
+
+def _writerun(path, items):
+    with open(path, 'wb') as f:
+        while True:
+            block = list(itertools.islice(items, _BLOCKSIZE))
+            if not block:
+                break
+            pickle.dump(block, f, pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _readrun(path):
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                block = pickle.load(f)
+            except EOFError:
+                break
+            for item in block:
+                yield item
+
+
+def _sortrun(args):
+    path, uris, key = args
+    return _writerun(path, _sorted(uris, key))
+
+
+def _merge(runs):
+    return _unique(heapq.merge(*map(_readrun, runs), key=_key))
+
+
+def _makeruns(chunks, key, processes, paths):
+    if processes == 1:
+        return [_sortrun((path, chunk, key))
+                for path, chunk in zip(paths, chunks)]
+    # imported here, since importing it slows down importing this package
+    import multiprocessing
+
+    pool = multiprocessing.Pool(processes)
+    try:
+        runs = []
+        pending = collections.deque()
+        for path, chunk in zip(paths, chunks):
+            # limit the number of chunks held in memory at once
+            if len(pending) >= processes:
+                runs.append(pending.popleft().get())
+            pending.append(pool.apply_async(_sortrun, ((path, chunk, key),)))
+        runs.extend(result.get() for result in pending)
+    finally:
+        pool.terminate()
+        pool.join()
+    return runs
+
+
+def uridedup(uris, key=urinormalize, maxmem=64 * 1024 * 1024, processes=1,
+             tmpdir=None):
+    """Sort `uris` by `key` using approximately `maxmem` bytes of memory,
+    and yield a `(key, uri)` tuple for the first URI of each distinct
+    key.
+
+    """
+    chunks = _chunks(uris, maxmem // processes)
+    first = next(chunks, [])
+    second = next(chunks, None)
+    if second is None:
+        # everything fits into memory
+        for item in _sorted(first, key):
+            yield item
+        return
+
+    tmpdir = tempfile.mkdtemp(prefix='urilib-', dir=tmpdir)
+    try:
+        paths = (os.path.join(tmpdir, '%d.run' % i) for i in itertools.count())
+        chunks = itertools.chain([first, second], chunks)
+        runs = _makeruns(chunks, key, processes, paths)
+        while len(runs) > _MAXRUNS:
+            merged = []
+            for i in range(0, len(runs), _MAXRUNS):
+                group = runs[i:i + _MAXRUNS]
+                merged.append(_writerun(next(paths), _merge(group)))
+                for path in group:
+                    os.remove(path)
+            runs = merged
+        for item in _merge(runs):
+            yield item
+    finally:
+        shutil.rmtree(tmpdir)
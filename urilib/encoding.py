@@ -1,4 +1,6 @@
 import re
+from encodings.idna import ToASCII, ToUnicode
+from functools import lru_cache
 from string import hexdigits
 
 from .chars import UNRESERVED
@@ -45,26 +47,67 @@ def uriencode(uristring, safe='', encoding='utf-8', errors='strict'):
 
 def uriencode_plus(uristring, safe='', encoding='utf-8', errors='strict'):
     """Encode a URI string or string component. Replace space with plus."""
-    if isinstance(safe, bytes):
-        safe = safe + b' '
+    if not isinstance(safe, bytes):
+        safe = safe.encode('ascii')
+    encode = _plusencoder(safe)
+    if isinstance(uristring, bytes):
+        return encode(uristring)
     else:
-        safe = safe + ' '
-    encode = uriencode(uristring, safe, encoding, errors)
+        return encode(uristring.encode(encoding, errors)).decode(encoding)
+
+
+@lru_cache(maxsize=None)
+def _plusencoder(safe):
+    # return a function encoding bytes with space replaced by plus
+    table = _encoded[b''][:]
+    for i in memoryview(safe).tolist():
+        table[i] = _fromint(i)
+    table[0x20] = b'+'
+    plain = bytes(i for i in range(256) if table[i] == _fromint(i))
+    getitem = table.__getitem__
+
+    def encode(data):
+        # strings without characters to encode are returned as they are
+        if not data.translate(None, plain):
+            return data
+        return b''.join(map(getitem, data))
+    return encode
+
+
+_ASCII = bytes(range(128))
+
+# int() also accepts whitespace and signs, so check for hex digits first
+_ishex = re.compile(b'[0-9A-Fa-f]{2}').match
+
+
+@lru_cache(maxsize=None)
+def _asciicompatible(encoding):
+    try:
+        return _ASCII.decode(encoding) == _ASCII.decode('ascii')
+    except UnicodeError:
+        return False
+
+
+def _isplain(uristring, encoding):
+    # ASCII strings without percent-encodings decode to themselves
     if isinstance(uristring, bytes):
-        return re.sub(b' ', b'+', encode)
+        escaped = b'%' in uristring
     else:
-        return re.sub(' ', '+', encode)
+        escaped = '%' in uristring
+    return not escaped and uristring.isascii() and _asciicompatible(encoding)
 
 
 def uridecode(uristring, encoding='utf-8', errors='strict'):
     """Decode a URI string or string component."""
+    if _isplain(uristring, encoding):
+        return uristring
     if isinstance(uristring, bytes):
         parts = uristring.split(b'%')
     else:
         parts = uristring.encode('utf-8', errors).split(b'%')
     bary = bytearray(parts[0])
     for s in parts[1:]:
-        if len(s) < 2:
+        if not _ishex(s):
             bary.append(b'%'[0])
             bary.extend(s)
         else:
@@ -89,13 +132,15 @@ def uridecode(uristring, encoding='utf-8', errors='strict'):
 
 def uridecode_safe(uristring, encoding='utf-8', errors='replace'):
     """Decode a URI string or string component. Prefer to be safe."""
+    if _isplain(uristring, encoding):
+        return uristring
     if isinstance(uristring, bytes):
         parts = uristring.split(b'%')
     else:
         parts = uristring.encode('utf-8', errors).split(b'%')
     bary = bytearray(parts[0])
     for s in parts[1:]:
-        if len(s) < 2:
+        if not _ishex(s):
             bary.append(b'%'[0])
             bary.extend(s)
         else:
@@ -124,9 +169,9 @@ def uridecode_safe(uristring, encoding='utf-8', errors='replace'):
 def uridecode_plus(uristring, encoding='utf-8', errors='strict'):
     """Decode a URI string or string component. Replace plus with space."""
     if isinstance(uristring, bytes):
-        uristring = re.sub(b'\+', b' ', uristring)
+        uristring = uristring.replace(b'+', b' ')
     else:
-        uristring = re.sub('\+', ' ', uristring)
+        uristring = uristring.replace('+', ' ')
     return uridecode(uristring, encoding, errors)
 
 
@@ -136,23 +181,139 @@ def uridecode_safe_plus(uristring, encoding='utf-8', errors='replace'):
     Prefer to safe.
     """
     if isinstance(uristring, bytes):
-        uristring = re.sub(b'\+', b' ', uristring)
+        uristring = uristring.replace(b'+', b' ')
     else:
-        uristring = re.sub('\+', ' ', uristring)
+        uristring = uristring.replace('+', ' ')
     return uridecode_safe(uristring, encoding, errors)
 
 
+# RFC 3986 6.2.2.2: percent-encoded octets that correspond to
+# unreserved characters are decoded, all other percent-encodings
+# use uppercase hexadecimal digits
+def _pctnormalized():
+    table = {}
+    for hi in hexdigits:
+        for lo in hexdigits:
+            byte = int(hi + lo, 16)
+            if byte in _unreserved:
+                table['%' + hi + lo] = chr(byte)
+            else:
+                table['%' + hi + lo] = '%' + (hi + lo).upper()
+    return table
+
+_pctnormalized_string = _pctnormalized()
+
+_pctnormalized_bytes = dict(
+    (k.encode('ascii'), v.encode('ascii'))
+    for k, v in _pctnormalized_string.items()
+)
+
+_PCT_RE_STRING = re.compile('%[0-9A-Fa-f]{2}')
+
+_PCT_RE_BYTES = re.compile(b'%[0-9A-Fa-f]{2}')
+
+
+def pctnormalize(uristring):
+    """Normalize the percent-encodings of a URI string or string
+    component.
+
+    """
+    if isinstance(uristring, bytes):
+        if b'%' not in uristring:
+            return uristring
+        table = _pctnormalized_bytes
+        return _PCT_RE_BYTES.sub(lambda m: table[m.group()], uristring)
+    else:
+        if '%' not in uristring:
+            return uristring
+        table = _pctnormalized_string
+        return _PCT_RE_STRING.sub(lambda m: table[m.group()], uristring)
+
+
+# RFC 3490 3.1: label separators recognized in internationalized
+# domain names
+_IDN_DOTS = re.compile('[\u002e\u3002\uff0e\uff61]')
+
+# maximum number of non-ASCII or ACE labels cached by the IDNA codec
+_IDNA_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=_IDNA_CACHE_SIZE)
+def _idnencode_label(label):
+    return ToASCII(label).decode('ascii')
+
+
+@lru_cache(maxsize=_IDNA_CACHE_SIZE)
+def _idndecode_label(label):
+    return ToUnicode(ToASCII(label))
+
+
+def _idncodec(domain, codec, ace):
+    if domain.isascii():
+        labels = domain.split('.')
+    else:
+        labels = _IDN_DOTS.split(domain)
+    # an empty last label denotes a trailing dot or an empty domain
+    for i in range(len(labels) if labels[-1] else len(labels) - 1):
+        label = labels[i]
+        # ASCII labels are passed through unchanged unless they are
+        # ACE labels that need to be decoded
+        if not (0 < len(label) < 64 and label.isascii()) or (
+                ace and 'xn--' in label):
+            labels[i] = codec(label)
+    return '.'.join(labels)
+
+
+def _idnplain(domain, ace):
+    # ASCII domain names that need no ACE decoding are passed through
+    # as bytes if all labels have valid lengths
+    if not domain.isascii() or (ace and b'xn--' in domain):
+        return False
+    labels = domain.split(b'.')
+    if not labels[-1]:
+        labels.pop()
+    for label in labels:
+        if not 0 < len(label) < 64:
+            return False
+    return True
+
+
+def _idnerrors(errors):
+    # IDNA is quite clear that implementations must be strict
+    if errors != 'strict':
+        raise UnicodeError('Unsupported error handling ' + errors)
+
+
 def idnencode(domain, encoding='utf-8', errors='strict'):
     """Encode International domain string."""
+    _idnerrors(errors)
     if not isinstance(domain, bytes):
-        return domain.encode('idna', errors).decode(encoding)
+        return _idncodec(domain, _idnencode_label, False)
+    elif _idnplain(domain, False):
+        return domain
     else:
-        return domain.decode(encoding, errors).encode('idna', errors)
+        domain = domain.decode(encoding, errors)
+        return _idncodec(domain, _idnencode_label, False).encode()
 
 
 def idndecode(domain, encoding='utf-8', errors='strict'):
     """Decode International domain string."""
+    _idnerrors(errors)
     if not isinstance(domain, bytes):
-        return domain.encode('idna').decode('idna', errors)
+        return _idncodec(domain, _idndecode_label, True)
+    elif _idnplain(domain, True):
+        return domain
     else:
-        return domain.decode(encoding, errors).encode('idna').decode('idna', errors).encode(encoding, errors)
+        domain = domain.decode(encoding, errors)
+        return _idncodec(domain, _idndecode_label, True).encode(
+            encoding, errors)
+
+
+def idnencode_many(domains, encoding='utf-8', errors='strict'):
+    """Encode a sequence of International domain strings."""
+    return [idnencode(domain, encoding, errors) for domain in domains]
+
+
+def idndecode_many(domains, encoding='utf-8', errors='strict'):
+    """Decode a sequence of International domain strings."""
+    return [idndecode(domain, encoding, errors) for domain in domains]
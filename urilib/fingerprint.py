@@ -0,0 +1,56 @@
+import array
+import hashlib
+
+from .normalize import _urinormalize
+
+
+def _update(update, value):
+    if isinstance(value, bytes):
+        update(value)
+    else:
+        update(value.encode('utf-8'))
+
+
+def urifingerprint(uri, bits=64):
+    """Return a `bits` wide integer fingerprint of the normalized form of
+    `uri`.
+
+    """
+    if bits % 8 or not 8 <= bits <= 512:
+        raise ValueError('Invalid fingerprint size')
+    scheme, authority, path, query, fragment = _urinormalize(uri)
+
+    # feed the normalized components to the hash in the same order
+    # and with the same delimiters as the recomposed URI string
+    h = hashlib.blake2b(digest_size=bits // 8)
+    update = h.update
+    if scheme is not None:
+        _update(update, scheme)
+        update(b':')
+    if authority is not None:
+        update(b'//')
+        _update(update, authority)
+    _update(update, path)
+    if query is not None:
+        update(b'?')
+        _update(update, query)
+    if fragment is not None:
+        update(b'#')
+        _update(update, fragment)
+    return int.from_bytes(h.digest(), 'big')
+
+
+def urifingerprint_many(uris, bits=64, out=None):
+    """Return the fingerprints of all `uris`, optionally storing them in
+    the preallocated sequence `out`.
+
+    """
+    if out is None:
+        out = array.array('Q') if bits <= 64 else []
+        append = out.append
+        for uri in uris:
+            append(urifingerprint(uri, bits))
+    else:
+        for i, uri in enumerate(uris):
+            out[i] = urifingerprint(uri, bits)
+    return out
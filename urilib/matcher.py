@@ -0,0 +1,185 @@
+import bisect
+import ipaddress
+import re
+
+from .encoding import idndecode
+from .split import urisplit
+
+_WILDCARDS = frozenset('*?')
+
+_GROUP = '_urilib_rule%d'
+
+# flags of regular expressions without inline flags
+_FLAGS = re.compile('').flags
+
+
+def _translate(glob, star, any):
+    result = []
+    for c in glob:
+        if c == '*':
+            result.append(star)
+        elif c == '?':
+            result.append(any)
+        else:
+            result.append(re.escape(c))
+    return ''.join(result)
+
+
+def _host(host):
+    # normalize rule hosts like SplitResult.gethost() and _subject()
+    try:
+        address = ipaddress.ip_address(host.strip('[]'))
+    except ValueError:
+        pass
+    else:
+        return _address(address)
+    try:
+        return idndecode(host.lower()).lower()
+    except ValueError:
+        return host.lower()
+
+
+def _address(address):
+    if address.version == 6:
+        return '[%s]' % address.compressed
+    else:
+        return address.compressed
+
+
+def _subject(uri):
+    result = urisplit(uri)
+    host = result.gethost()
+    if host is None:
+        host = ''
+    elif isinstance(host, bytes):
+        host = host.decode('utf-8', 'replace')
+    elif not isinstance(host, str):
+        host = _address(host)
+    path = result.getpath()
+    if isinstance(path, bytes):
+        path = path.decode('utf-8', 'replace')
+    return host, path or '/'
+
+
+class _PathIndex(object):
+
+    def __init__(self):
+        self.exact = {}
+        self.prefixes = {}
+        self.lengths = []
+
+    def add(self, glob, rule):
+        if not _WILDCARDS.intersection(glob):
+            self.exact.setdefault(glob, []).append(rule)
+        elif glob.endswith('*') and not _WILDCARDS.intersection(glob[:-1]):
+            prefix = glob[:-1]
+            if len(prefix) not in self.lengths:
+                bisect.insort(self.lengths, len(prefix))
+            self.prefixes.setdefault(prefix, []).append(rule)
+        else:
+            return False
+        return True
+
+    def match(self, path, result):
+        rules = self.exact.get(path)
+        if rules:
+            result.extend(rules)
+        prefixes = self.prefixes
+        for n in self.lengths:
+            if n > len(path):
+                break
+            rules = prefixes.get(path[:n])
+            if rules:
+                result.extend(rules)
+
+
+class URIMatcher(object):
+    """Compiled set of URI host and path rules."""
+
+    def __init__(self, rules):
+        self._rules = list(rules)
+        self._any = _PathIndex()
+        self._hosts = {}
+        self._suffixes = {}
+        regexes = []
+        self._patterns = []
+        for i, rule in enumerate(self._rules):
+            if rule.startswith('re:'):
+                try:
+                    pattern = re.compile(rule[3:])
+                except re.error as e:
+                    raise ValueError('Invalid rule %r: %s' % (rule, e))
+                # groups and inline flags would change the meaning of
+                # other rules or of the rule itself when combined
+                if pattern.groups or pattern.flags != _FLAGS:
+                    self._patterns.append((i, pattern))
+                else:
+                    regexes.append((i, rule[3:]))
+                continue
+            host, slash, path = rule.partition('/')
+            path = slash + path if slash else '*'
+            if host in ('', '*'):
+                index = self._any
+            elif not _WILDCARDS.intersection(host):
+                host = _host(host)
+                index = self._hosts.setdefault(host, _PathIndex())
+            elif host.startswith('*.') and not _WILDCARDS.intersection(
+                    host[2:]):
+                host = '*.' + _host(host[2:])
+                index = self._suffixes.setdefault(host[2:], _PathIndex())
+            else:
+                host = _host(host)
+                index = None
+            if index is None or not index.add(path, i):
+                pattern = (_translate(host, '[^/]*', '[^/]') +
+                           _translate(path, '.*', '.') + r'\Z')
+                regexes.append((i, pattern))
+        # remaining rules are combined into a single regular expression
+        # using one optional lookahead group per rule
+        if regexes:
+            self._regex = re.compile(''.join(
+                '(?:(?=(?P<%s>%s)))?' % (_GROUP % i, pattern)
+                for i, pattern in regexes
+            ))
+            self._groups = dict((_GROUP % i, i) for i, _ in regexes)
+        else:
+            self._regex = None
+
+    def __len__(self):
+        return len(self._rules)
+
+    def match(self, uri):
+        """Return the list of rules matching `uri`, in rule order."""
+        host, path = _subject(uri)
+        result = []
+        self._any.match(path, result)
+        index = self._hosts.get(host)
+        if index is not None:
+            index.match(path, result)
+        suffixes = self._suffixes
+        if suffixes:
+            i = host.find('.')
+            while i >= 0:
+                index = suffixes.get(host[i + 1:])
+                if index is not None:
+                    index.match(path, result)
+                i = host.find('.', i + 1)
+        subject = host + path
+        if self._regex is not None:
+            groups = self._groups
+            m = self._regex.match(subject)
+            for name, value in m.groupdict().items():
+                if value is not None and name in groups:
+                    result.append(groups[name])
+        for i, pattern in self._patterns:
+            if pattern.match(subject):
+                result.append(i)
+        rules = self._rules
+        return [rules[i] for i in sorted(set(result))]
+
+    def match_many(self, uris):
+        """Return a list of the lists of rules matching each of
+        `uris`.
+
+        """
+        return [self.match(uri) for uri in uris]
@@ -1,7 +1,11 @@
-import collections
-from .compose import uricompose
-from .split import urisplit, querylist
-from unicodedata import normalize as unicodenormalize
+import fnmatch
+import re
+
+from .compose import (_Bytes, _String, _authority, _fragment, _path, _query,
+                      _scheme, _uricompose)
+from .split import urisplit, uriunsplit, querylist
+from operator import itemgetter
+from unicodedata import is_normalized, normalize as unicodenormalize
 
 _default_port = {
     'http': 80,
@@ -19,43 +23,220 @@ _default_port = {
     'prospero': 191,
 }
 
+# default ports looked up by bytes schemes
+_default_port.update([(k.encode('ascii'), v)
+                      for k, v in list(_default_port.items())])
+
+_missing = object()
+
+
 def _unicodenormalize(ustr, method='NFC'):
-    if isinstance(ustr, bytes):
-        return unicodenormalize(method, ustr.decode('utf-8')).encode('utf-8')
+    # ASCII and already normalized strings are returned as they are
+    if ustr.isascii():
+        return ustr
+    elif isinstance(ustr, bytes):
+        decoded = ustr.decode('utf-8')
+        if is_normalized(method, decoded):
+            return ustr
+        return unicodenormalize(method, decoded).encode('utf-8')
+    elif is_normalized(method, ustr):
+        return ustr
     else:
         return unicodenormalize(method, ustr)
 
 def urinormalize(uri):
     """Normalize URIs"""
-    if isinstance(uri, bytes):
-        DOT = b'.'
-        SLASH = b'/'
-    else:
-        DOT = '.'
-        SLASH = '/'
-    result = urisplit(uri)
+    return uriunsplit(_urinormalize(uri))
+
+
+def uriequivalent(a, b):
+    """Return whether `a` and `b` have the same normalized form,
+    comparing one component at a time.
+
+    """
+    return _equivalent(_Components(a), _Components(b))
+
+
+def uriequivalent_many(uri, candidates):
+    """Return a list of booleans indicating whether each of
+    `candidates` is equivalent to `uri`.
+
+    """
+    components = _Components(uri)
+    return [_equivalent(components, _Components(candidate))
+            for candidate in candidates]
+
+
+def _equivalent(a, b):
+    if a.t is not b.t:
+        return False
+    for i in range(5):
+        # equal components have equal normalized forms, as long as all
+        # preceding components are equivalent
+        if a.result[i] != b.result[i] and a.get(i) != b.get(i):
+            return False
+    return True
+
+
+def _urinormalize(uri, policy=None):
+    # return the normalized components of a URI
+    result = _split(uri)
     scheme = result.getscheme()
+    userinfo, host, port = _getauthority(result, scheme)
+    path = _getpath(result)
+    qsl = _getquerylist(result)
+    fragment = _getfragment(result)
+    if policy is not None:
+        path, qsl, fragment = policy._apply(host, path, qsl, fragment)
+    return _uricompose(scheme, None, path, qsl, fragment, userinfo, host, port,
+                       'utf-8')
+
+
+class _Components(object):
+    # normalized components of a URI, computed when first needed
+
+    def __init__(self, uri):
+        self.result = _split(uri)
+        if isinstance(self.result.path, bytes):
+            self.t = _Bytes
+        else:
+            self.t = _String
+        self.values = [_missing] * 5
+
+    def get(self, i):
+        value = self.values[i]
+        if value is _missing:
+            value = self.values[i] = self.normalize(i)
+        return value
+
+    def normalize(self, i):
+        result = self.result
+        t = self.t
+        if i == 0:
+            return _scheme(result.getscheme(), t)
+        scheme = self.get(0)
+        if i == 1:
+            userinfo, host, port = _getauthority(result, scheme)
+            return _authority(userinfo, host, port, 'utf-8', t)
+        elif i == 2:
+            return _path(_getpath(result), scheme, self.get(1), 'utf-8', t)
+        elif i == 3:
+            return _query(_getquerylist(result), 'utf-8', t)
+        else:
+            return _fragment(_getfragment(result), 'utf-8', t)
+
+
+def _split(uri):
+    if isinstance(uri, (bytearray, memoryview)):
+        uri = bytes(uri)
+    return urisplit(uri)
+
+
+# the decoded and Unicode-normalized components of a split result,
+# which are encoded again by _uricompose()
+
+def _getauthority(result, scheme):
     userinfo = result.getuserinfo()
     if userinfo:
         userinfo = _unicodenormalize(userinfo)
     host = result.gethost()
-    if isinstance(host, collections.Iterable) and host[-1] == DOT:
+    if isinstance(host, type(result.DOT)) and host.endswith(result.DOT):
         host = host[:-1]
     port = result.getport()
     if scheme and port and port == _default_port.get(scheme, None):
         port = None
+    return userinfo, host, port
+
+
+def _getpath(result):
     path = result.getpath()
     if path:
-        path = _unicodenormalize(path)
+        return _unicodenormalize(path)
     else:
-        path = SLASH
+        return result.SLASH
+
+
+def _getquerylist(result):
     query = result.query
     if query:
-        qsl = querylist(_unicodenormalize(query))
+        return querylist(_unicodenormalize(query))
     else:
-        qsl = None
+        return None
+
+
+def _getfragment(result):
     fragment = result.getfragment()
     if fragment:
-        fragment = _unicodenormalize(fragment)
-    return uricompose(scheme=scheme, path=path, query=qsl, fragment=fragment,
-                      userinfo=userinfo, host=host, port=port)
+        return _unicodenormalize(fragment)
+    else:
+        return fragment
+
+
+class NormalizationPolicy(object):
+    """Compiled set of additional normalization steps, applied by
+    :meth:`normalize` in the same pass as :func:`urinormalize`.
+
+    """
+
+    def __init__(self, strip_params=(), sort_query=False, drop_fragment=False,
+                 index_pages=(), lowercase_path_hosts=()):
+        names = set()
+        patterns = []
+        for name in strip_params:
+            if any(c in name for c in '*?['):
+                patterns.append(fnmatch.translate(name))
+            else:
+                names.add(name)
+        self._strip_names = frozenset(names)
+        if patterns:
+            self._strip_re = re.compile('|'.join(patterns))
+        else:
+            self._strip_re = None
+        self._sort_query = sort_query
+        self._drop_fragment = drop_fragment
+        # index pages are compared to both string and bytes paths
+        self._index_pages = frozenset(
+            list(index_pages) + [page.encode('utf-8') for page in index_pages]
+        )
+        self._lowercase_path_hosts = frozenset(
+            host.lower() for host in lowercase_path_hosts
+        )
+
+    def normalize(self, uri):
+        """Normalize `uri` like :func:`urinormalize` and apply all steps
+        of the policy.
+
+        """
+        return uriunsplit(_urinormalize(uri, self))
+
+    def normalize_many(self, uris):
+        """Return a list of the normalized forms of all `uris`."""
+        return [uriunsplit(_urinormalize(uri, self)) for uri in uris]
+
+    def _apply(self, host, path, qsl, fragment):
+        if qsl and (self._strip_names or self._strip_re is not None):
+            qsl = [item for item in qsl if not self._strip(item[0])] or None
+        if qsl and self._sort_query:
+            qsl.sort(key=itemgetter(0))  # stable for repeated names
+        if self._drop_fragment:
+            fragment = None
+        if self._lowercase_path_hosts and host is not None:
+            if isinstance(host, bytes):
+                host = host.decode('utf-8', 'replace')
+            if str(host) in self._lowercase_path_hosts:
+                path = path.lower()
+        if self._index_pages:
+            if isinstance(path, bytes):
+                head, sep, tail = path.rpartition(b'/')
+            else:
+                head, sep, tail = path.rpartition('/')
+            if sep and tail in self._index_pages:
+                path = head + sep
+        return path, qsl, fragment
+
+    def _strip(self, name):
+        if isinstance(name, bytes):
+            name = name.decode('utf-8', 'replace')
+        if name in self._strip_names:
+            return True
+        return self._strip_re is not None and self._strip_re.match(name)
@@ -0,0 +1,392 @@
+import array
+import codecs
+import os
+import struct
+import sys
+
+from .encoding import uridecode_safe
+from .split import SplitResultBytes, SplitResultString
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _hexvalues():
+    table = numpy.full(256, -1, dtype=numpy.int16)
+    for i, c in enumerate(b'0123456789abcdef'):
+        table[c] = i
+    for i, c in enumerate(b'ABCDEF', 10):
+        table[c] = i
+    return table
+
+
+def _upper():
+    table = numpy.arange(256, dtype=numpy.uint8)
+    table[ord('a'):ord('f') + 1] -= 32
+    return table
+
+
+if numpy is not None:
+    _HEXVALUES = _hexvalues()
+    _UPPER = _upper()
+
+
+def _decode_python(data, offsets, encoding, errors):
+    data = memoryview(data).cast('B')
+    result = bytearray()
+    resultoffsets = array.array('q', [0])
+    for i in range(len(offsets) - 1):
+        result.extend(uridecode_safe(data[offsets[i]:offsets[i + 1]].tobytes(),
+                                     encoding, errors))
+        resultoffsets.append(len(result))
+    return result, resultoffsets
+
+
+def _decode_numpy(data, offsets, encoding, errors):
+    data = numpy.frombuffer(data, dtype=numpy.uint8)
+    offsets = numpy.asarray(offsets, dtype=numpy.int64)
+    if len(offsets) == 0:
+        offsets = numpy.zeros(1, dtype=numpy.int64)
+    data = data[offsets[0]:offsets[-1]]
+    offsets = offsets - offsets[0]
+    # locate percent signs followed by two hex digits within the same
+    # component
+    pos = numpy.flatnonzero(data == 0x25)
+    ends = offsets[numpy.searchsorted(offsets, pos, side='right')]
+    pos = pos[pos + 2 < ends]
+    hi = _HEXVALUES[data[pos + 1]]
+    lo = _HEXVALUES[data[pos + 2]]
+    valid = (hi >= 0) & (lo >= 0)
+    pos, values = pos[valid], (hi[valid] << 4) | lo[valid]
+    # control characters stay encoded with uppercase hex digits
+    control = values < 32
+    result = data.copy()
+    for i in (1, 2):
+        index = pos[control] + i
+        result[index] = _UPPER[result[index]]
+    pos, values = pos[~control], values[~control]
+    result[pos] = values
+    keep = numpy.ones(len(data), dtype=bool)
+    keep[pos + 1] = False
+    keep[pos + 2] = False
+    result = result[keep]
+    # decoded triplets never span components, so each one before an
+    # offset shortens the buffer by two octets
+    offsets = offsets - 2 * numpy.searchsorted(pos, offsets)
+    # components with non-ASCII octets are checked for decoding errors
+    # like uridecode_safe() does
+    nonascii = numpy.flatnonzero(result >= 0x80)
+    if len(nonascii) and not _isutf8(result, offsets, encoding):
+        # indexes of components with non-ASCII octets, in sorted order
+        indexes = numpy.searchsorted(offsets, nonascii, side='right') - 1
+        indexes = indexes[numpy.concatenate(([True],
+                                             indexes[1:] != indexes[:-1]))]
+        result, offsets = _recode(result, offsets, indexes, encoding, errors)
+    return result, offsets
+
+
+def _isutf8(data, offsets, encoding):
+    # all components are valid UTF-8 if the whole buffer is, and no
+    # component starts with a continuation byte
+    if codecs.lookup(encoding).name != 'utf-8':
+        return False
+    try:
+        data.tobytes().decode('utf-8')
+    except UnicodeDecodeError:
+        return False
+    starts = data[offsets[:-1][offsets[:-1] < len(data)]]
+    return not numpy.any((starts & 0xc0) == 0x80)
+
+
+def _recode(data, offsets, indexes, encoding, errors):
+    parts = []
+    lengths = numpy.diff(offsets)
+    start = 0
+    for i in indexes:
+        begin, end = offsets[i], offsets[i + 1]
+        value = data[begin:end].tobytes()
+        recoded = value.decode(encoding, errors).encode(encoding)
+        if recoded != value:
+            parts.append(data[start:begin])
+            parts.append(numpy.frombuffer(recoded, dtype=numpy.uint8))
+            lengths[i] = len(recoded)
+            start = end
+    if not parts:
+        return data, offsets
+    parts.append(data[start:])
+    offsets = numpy.concatenate(([0], numpy.cumsum(lengths)))
+    return numpy.concatenate(parts), offsets
+
+
+def uridecode_safe_packed(data, offsets, encoding='utf-8', errors='replace'):
+    """Decode all components packed into the byte buffer `data`, where
+    component `i` spans ``data[offsets[i]:offsets[i + 1]]``, like
+    :func:`uridecode_safe`, and return a tuple of the decoded buffer
+    and its offsets.
+
+    """
+    if numpy is not None:
+        return _decode_numpy(data, offsets, encoding, errors)
+    else:
+        return _decode_python(data, offsets, encoding, errors)
+
+
+def _split_python(data, offsets):
+    match = SplitResultBytes.RE.match
+    starts = []
+    ends = []
+    for i in range(len(offsets) - 1):
+        # spans of absent groups are (-1, -1)
+        m = match(data, offsets[i], offsets[i + 1])
+        spans = (m.span(1), m.span(2), m.span(3), m.span(4), m.span(5))
+        starts.append(tuple([span[0] for span in spans]))
+        ends.append(tuple([span[1] for span in spans]))
+    return starts, ends
+
+
+def _positions(data, chars):
+    mask = data == chars[0]
+    for c in chars[1:]:
+        mask |= data == c
+    # a sentinel simplifies searching past the last position
+    return numpy.append(numpy.flatnonzero(mask), len(data))
+
+
+def _first(positions, start, end):
+    # position of the first character at or after start, or end
+    index = numpy.searchsorted(positions, start)
+    index = numpy.minimum(index, len(positions) - 1)
+    return numpy.minimum(positions[index], end)
+
+
+def _split_numpy(data, offsets):
+    data = numpy.frombuffer(data, dtype=numpy.uint8)
+    offsets = numpy.asarray(offsets, dtype=numpy.int64)
+    if len(offsets) == 0:
+        offsets = numpy.zeros(1, dtype=numpy.int64)
+    begin, end = offsets[:-1], offsets[1:]
+    starts = numpy.full((len(begin), 5), -1, dtype=numpy.int64)
+    ends = numpy.full((len(begin), 5), -1, dtype=numpy.int64)
+    # pad the data, so that lookahead at component ends is safe
+    padded = numpy.append(data, numpy.zeros(2, dtype=numpy.uint8))
+
+    # RFC 3986 Appendix B: the scheme is a non-empty run of characters
+    # other than ":/?#" followed by ":"
+    pos = _first(_positions(data, b':/?#'), begin, end)
+    present = (pos > begin) & (pos < end) & (padded[pos] == 0x3a)
+    starts[present, 0] = begin[present]
+    ends[present, 0] = pos[present]
+    pos = numpy.where(present, pos + 1, begin)
+
+    # authority starts with "//" and ends before the first "/?#"
+    present = ((pos + 1 < end) & (padded[pos] == 0x2f) &
+               (padded[pos + 1] == 0x2f))
+    authend = _first(_positions(data, b'/?#'), pos + 2, end)
+    starts[present, 1] = pos[present] + 2
+    ends[present, 1] = authend[present]
+    pos = numpy.where(present, authend, pos)
+
+    # path is always present, ending before the first "?#"
+    pathend = _first(_positions(data, b'?#'), pos, end)
+    starts[:, 2] = pos
+    ends[:, 2] = pathend
+    pos = pathend
+
+    # query starts with "?" and ends before the first "#"
+    present = (pos < end) & (padded[pos] == 0x3f)
+    queryend = _first(_positions(data, b'#'), pos + 1, end)
+    starts[present, 3] = pos[present] + 1
+    ends[present, 3] = queryend[present]
+    pos = numpy.where(present, queryend, pos)
+
+    # fragment starts with "#", and like the regular expression ".*"
+    # ends before the first newline
+    present = (pos < end) & (padded[pos] == 0x23)
+    fragmentend = _first(_positions(data, b'\n'), pos + 1, end)
+    starts[present, 4] = pos[present] + 1
+    ends[present, 4] = fragmentend[present]
+    return starts, ends
+
+
+def urisplit_packed(data, offsets):
+    """Split all URIs packed into the byte buffer `data`, where URI
+    `i` spans ``data[offsets[i]:offsets[i + 1]]``, like
+    :func:`urisplit`, and return a tuple of the start and end offsets
+    of their components.
+
+    """
+    if numpy is not None:
+        return _split_numpy(data, offsets)
+    else:
+        return _split_python(data, offsets)
+
+
+# magic, number of URIs, data size, string flag
+_HEADER = struct.Struct('<8sQQQ')
+
+_MAGIC = b'URISPL01'
+
+
+class SplitResultArray(object):
+    """Sequence of :func:`urisplit` results stored in a single buffer,
+    which can be shared between processes without pickling individual
+    results.
+
+    """
+
+    def __init__(self, uris=()):
+        uris = [bytes(uri) if isinstance(uri, (bytearray, memoryview))
+                else uri for uri in uris]
+        types = set(map(type, uris))
+        isstring = str in types
+        if not types.issubset([str] if isstring else [bytes]):
+            raise TypeError('URIs must be all strings or all bytes')
+        if isstring:
+            # delimiters are ASCII, so UTF-8 octet offsets split
+            # strings just like characters
+            uris = [uri.encode('utf-8', 'surrogatepass') for uri in uris]
+        offsets = [0]
+        for uri in uris:
+            offsets.append(offsets[-1] + len(uri))
+        data = b''.join(uris)
+        starts, ends = urisplit_packed(data, offsets)
+        self._setup(len(uris), data, _flatten(starts), _flatten(ends),
+                    isstring, None)
+
+    def _setup(self, count, data, starts, ends, isstring, shm):
+        self._count = count
+        self._data = data
+        self._starts = starts
+        self._ends = ends
+        self._isstring = isstring
+        self._shm = shm
+
+    def share(self):
+        """Copy the results to a new shared memory block and return its
+        name, to be passed to :meth:`attach` in another process.
+
+        """
+        starts = array.array('q', self._starts)
+        ends = array.array('q', self._ends)
+        if sys.byteorder != 'little':
+            starts.byteswap()
+            ends.byteswap()
+        header = _HEADER.pack(_MAGIC, self._count, len(self._data),
+                              self._isstring)
+        parts = [header, starts.tobytes(), ends.tobytes(), self._data]
+        size = sum(len(part) for part in parts)
+        shm = _sharedmemory(False, create=True, size=max(size, 1))
+        try:
+            pos = 0
+            for part in parts:
+                shm.buf[pos:pos + len(part)] = part
+                pos += len(part)
+        finally:
+            shm.close()
+        return shm.name
+
+    @classmethod
+    def attach(cls, name, unlink=True):
+        """Return the results shared by :meth:`share` under `name`,
+        removing the shared memory block once it is mapped unless
+        `unlink` is false.
+
+        """
+        shm = _sharedmemory(unlink, name=name)
+        if unlink:
+            shm.unlink()
+        try:
+            magic, count, size, isstring = _HEADER.unpack_from(shm.buf)
+            if magic != _MAGIC:
+                raise ValueError('Invalid shared split results')
+            buf = shm.buf
+            pos = _HEADER.size
+            end = pos + 8 * 5 * count
+            if sys.byteorder == 'little':
+                starts = buf[pos:end].cast('q')
+                ends = buf[end:end + 8 * 5 * count].cast('q')
+            else:
+                starts = array.array('q', buf[pos:end])
+                ends = array.array('q', buf[end:end + 8 * 5 * count])
+                starts.byteswap()
+                ends.byteswap()
+            pos = end + 8 * 5 * count
+            data = buf[pos:pos + size]
+        except (TypeError, ValueError, struct.error):
+            shm.close()
+            raise ValueError('Invalid shared split results')
+        result = cls.__new__(cls)
+        result._setup(count, data, starts, ends, bool(isstring), shm)
+        return result
+
+    def close(self):
+        """Close the shared memory block of attached results, if any."""
+        if self._shm is not None:
+            for view in (self._starts, self._ends, self._data):
+                if isinstance(view, memoryview):
+                    view.release()
+            self._shm.close()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('index out of range')
+        data = self._data
+        starts = self._starts
+        ends = self._ends
+        parts = []
+        for i in range(5 * index, 5 * index + 5):
+            start = starts[i]
+            if start < 0:
+                parts.append(None)
+            else:
+                parts.append(bytes(data[start:ends[i]]))
+        if self._isstring:
+            parts = [part.decode('utf-8', 'surrogatepass')
+                     if part is not None else None for part in parts]
+            return SplitResultString(*parts)
+        else:
+            return SplitResultBytes(*parts)
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self[i]
+
+
+def _sharedmemory(track, **kwargs):
+    # imported here, since importing it slows down importing this package
+    from multiprocessing import shared_memory
+
+    # untracked blocks are not unlinked by the resource tracker when
+    # the process exits, since attach() takes over their ownership
+    if track:
+        return shared_memory.SharedMemory(**kwargs)
+    elif sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(track=False, **kwargs)
+    shm = shared_memory.SharedMemory(**kwargs)
+    if os.name == 'posix':
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+
+def _flatten(offsets):
+    if numpy is not None and isinstance(offsets, numpy.ndarray):
+        return array.array('q', offsets.astype(numpy.int64).tobytes())
+    result = array.array('q')
+    for row in offsets:
+        result.extend(row)
+    return result
@@ -0,0 +1,221 @@
+import io
+import ipaddress
+import json
+import os.path
+
+# Public Suffix List, https://publicsuffix.org/list/
+_BUNDLED_LIST = os.path.join(os.path.dirname(__file__),
+                             'public_suffix_list.dat')
+
+_PRIVATE_BEGIN = '// ===BEGIN PRIVATE DOMAINS==='
+
+# trie nodes map reversed domain labels to child nodes; the empty
+# label, which can never occur in a rule, marks the end of a rule
+_KIND, _RULE, _EXCEPTION = '', 1, 2
+
+_WILDCARD = '*'
+
+_FORMAT_VERSION = 1
+
+_ADDRESS_TYPES = (ipaddress.IPv4Address, ipaddress.IPv6Address)
+
+
+def _labels(domain):
+    labels = domain.lower().rstrip('.').split('.')
+    if not all(labels):
+        return None
+    labels.reverse()
+    return labels
+
+
+class PublicSuffixList(object):
+    """Public Suffix List compiled into a reversed-label trie."""
+
+    def __init__(self, rules=()):
+        self._trie = {}
+        for rule in rules:
+            self.add(rule)
+
+    @classmethod
+    def fromfile(cls, path=None, private=True, encoding='utf-8'):
+        """Compile a Public Suffix List file, or the bundled copy of the
+        list if `path` is :const:`None`.  If `private` is
+        :const:`False`, rules from the private domains section of the
+        list are ignored.
+
+        """
+        result = cls()
+        with io.open(path or _BUNDLED_LIST, encoding=encoding) as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith(_PRIVATE_BEGIN) and not private:
+                    break
+                elif line and not line.startswith('//'):
+                    result.add(line.split()[0])
+        return result
+
+    @classmethod
+    def load(cls, fp):
+        """Load a compiled list previously written by :meth:`dump`."""
+        data = json.load(fp)
+        if data.get('version') != _FORMAT_VERSION:
+            raise ValueError('Unsupported compiled list format')
+        result = cls()
+        result._trie = data['trie']
+        return result
+
+    def dump(self, fp):
+        """Write the compiled list to the text file object `fp`."""
+        fp.write(json.dumps({'version': _FORMAT_VERSION, 'trie': self._trie},
+                            separators=(',', ':'), ensure_ascii=False))
+
+    def add(self, rule):
+        """Add a single rule in Public Suffix List syntax."""
+        if rule.startswith('!'):
+            rule, kind = rule[1:], _EXCEPTION
+        else:
+            kind = _RULE
+        labels = _labels(rule)
+        if labels is None:
+            raise ValueError('Invalid public suffix rule %r' % rule)
+        self._insert(labels, kind)
+        # also match hosts given in their IDNA encoded form
+        try:
+            encoded = [label if label == _WILDCARD else
+                       label.encode('idna').decode('ascii')
+                       for label in labels]
+        except UnicodeError:
+            return
+        if encoded != labels:
+            self._insert(encoded, kind)
+
+    def _insert(self, labels, kind):
+        node = self._trie
+        for label in labels:
+            node = node.setdefault(label, {})
+        node[_KIND] = kind
+
+    def _suffixlen(self, labels):
+        # the implicit "*" rule applies if no other rule matches
+        result = 1
+        n = len(labels)
+        stack = [(self._trie, 0)]
+        while stack:
+            node, i = stack.pop()
+            kind = node.get(_KIND)
+            if kind == _EXCEPTION:
+                return i - 1
+            elif kind == _RULE and i > result:
+                result = i
+            if i < n:
+                child = node.get(labels[i])
+                if child is not None:
+                    stack.append((child, i + 1))
+                child = node.get(_WILDCARD)
+                if child is not None:
+                    stack.append((child, i + 1))
+        return result
+
+    def _split(self, host):
+        if host is None or isinstance(host, _ADDRESS_TYPES):
+            return None
+        elif isinstance(host, bytes):
+            labels = _labels(host.decode('utf-8'))
+        else:
+            labels = _labels(host)
+        if labels is None:
+            return None
+        return labels, min(self._suffixlen(labels), len(labels))
+
+    @staticmethod
+    def _join(host, labels):
+        labels.reverse()
+        domain = '.'.join(labels)
+        if isinstance(host, bytes):
+            return domain.encode('utf-8')
+        else:
+            return domain
+
+    def getpublicsuffix(self, host, default=None):
+        """Return the public suffix of `host`, or `default` if `host` is
+        not a registered name.
+
+        """
+        split = self._split(host)
+        if split is None:
+            return default
+        labels, n = split
+        return self._join(host, labels[:n])
+
+    def getregistrabledomain(self, host, default=None):
+        """Return the registrable domain of `host`, i.e. its public suffix
+        plus one additional label, or `default` if `host` is not a
+        registered name or is a public suffix itself.
+
+        """
+        split = self._split(host)
+        if split is None:
+            return default
+        labels, n = split
+        if n < len(labels):
+            return self._join(host, labels[:n + 1])
+        else:
+            return default
+
+    def getpublicsuffixes(self, hosts, default=None):
+        """Return a list of the public suffixes of all `hosts`."""
+        return _batch(self.getpublicsuffix, hosts, default)
+
+    def getregistrabledomains(self, hosts, default=None):
+        """Return a list of the registrable domains of all `hosts`."""
+        return _batch(self.getregistrabledomain, hosts, default)
+
+
+def _batch(func, hosts, default):
+    cache = {}
+    result = []
+    for host in hosts:
+        try:
+            value = cache[host]
+        except KeyError:
+            value = cache[host] = func(host, default)
+        except TypeError:  # unhashable
+            value = func(host, default)
+        result.append(value)
+    return result
+
+
+_default_list = None
+
+
+def _getdefaultlist():
+    global _default_list
+    if _default_list is None:
+        _default_list = PublicSuffixList.fromfile()
+    return _default_list
+
+
+def getpublicsuffix(host, default=None):
+    """Return the public suffix of `host` according to the bundled
+    Public Suffix List, or `default` if `host` is not a registered
+    name.
+
+    """
+    return _getdefaultlist().getpublicsuffix(host, default)
+
+
+def getregistrabledomain(host, default=None):
+    """Return the registrable domain of `host` according to the bundled
+    Public Suffix List, or `default` if `host` has no registrable
+    domain.
+
+    """
+    return _getdefaultlist().getregistrabledomain(host, default)
+
+
+def getregistrabledomains(hosts, default=None):
+    """Return a list of the registrable domains of all `hosts` according
+    to the bundled Public Suffix List.
+
+    """
+    return _getdefaultlist().getregistrabledomains(hosts, default)
@@ -0,0 +1,89 @@
+from .split import urisplit
+
+
+def urirelativize(base, target):
+    """Return the shortest URI reference that :func:`urijoin` resolves
+    against `base` to `target`.
+
+    """
+    return URIRelativizer(base).relativize(target)
+
+
+class URIRelativizer(object):
+    """Base URI prepared for computing relative references to many
+    target URIs.
+
+    """
+
+    def __init__(self, base):
+        self._base = base = urisplit(base)
+        # RFC 3986 5.2.3: relative paths are merged with the base path
+        # up to its last slash, or with "/" if the base has an
+        # authority and an empty path; resolving "." against the base
+        # also removes the dot segments of this directory
+        if base.authority is not None or base.SLASH in base.path:
+            directory = base.transform(base.DOT).path
+            self._segments = directory.split(base.SLASH)[:-1]
+        else:
+            self._segments = []
+
+    def relativize(self, target):
+        """Return the shortest URI reference that resolves against the
+        base URI to `target`.
+
+        """
+        base = self._base
+        # resolving the target also removes its dot segments
+        result = base.transform(target)
+        scheme, authority, path, query, fragment = result
+        if scheme != base.scheme:
+            return result.geturi()
+        if authority != base.authority:
+            if authority is None:
+                return result.geturi()
+            return result._replace(scheme=None).geturi()
+        if path == base.path and (query is not None or base.query is None):
+            if query == base.query:
+                query = None
+            return result._replace(scheme=None, authority=None,
+                                   path=base.EMPTY, query=query).geturi()
+        ref = result._replace(scheme=None, authority=None,
+                              path=self._path(path)).geturi()
+        # relative references to rootless or empty paths may not exist,
+        # and bases with unusual paths may resolve them differently
+        if base.transform(ref) == result:
+            return ref
+        elif path.startswith(base.SLASH) and not path.startswith(
+                base.SLASH * 2):
+            return result._replace(scheme=None, authority=None).geturi()
+        elif authority is not None:
+            return result._replace(scheme=None).geturi()
+        else:
+            return result.geturi()
+
+    def relativize_many(self, targets):
+        """Return a list of the relative references to all `targets`."""
+        return [self.relativize(target) for target in targets]
+
+    def _path(self, path):
+        base = self._base
+        prefix = self._segments
+        segments = path.split(base.SLASH)
+        n = 0
+        end = min(len(prefix), len(segments) - 1)
+        while n < end and prefix[n] == segments[n]:
+            n += 1
+        if n < len(prefix):
+            parts = [base.DOTDOT] * (len(prefix) - n) + segments[n:]
+        elif not segments[n] or base.COLON in segments[n]:
+            # RFC 3986 4.2: a first segment containing a colon would be
+            # mistaken for a scheme name, and an empty one for an
+            # authority or the base URI itself
+            parts = [base.DOT] + segments[n:]
+        else:
+            parts = segments[n:]
+        relative = base.SLASH.join(parts)
+        if (path.startswith(base.SLASH) and len(path) < len(relative) and
+                not path.startswith(base.SLASH * 2)):
+            return path
+        return relative
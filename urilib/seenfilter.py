@@ -0,0 +1,148 @@
+import math
+import mmap
+import struct
+
+from .fingerprint import urifingerprint
+
+# magic, number of bits, number of hash functions, number of items
+_HEADER = struct.Struct('<8sQQQ')
+
+_COUNT = struct.Struct('<Q')
+
+_COUNT_OFFSET = _HEADER.size - _COUNT.size
+
+_MAGIC = b'URISEEN2'
+
+_MASK64 = (1 << 64) - 1
+
+
+def _dimensions(capacity, error_rate):
+    if capacity < 1:
+        raise ValueError('Invalid capacity')
+    if not 0 < error_rate < 1:
+        raise ValueError('Invalid error rate')
+    ln2 = math.log(2)
+    nbits = int(math.ceil(-capacity * math.log(error_rate) / ln2 ** 2))
+    nhashes = max(1, int(round(nbits / float(capacity) * ln2)))
+    return nbits, nhashes
+
+
+class URISeenFilter(object):
+    """Bloom filter holding the normalized forms of URIs."""
+
+    def __init__(self, capacity, error_rate=0.01):
+        nbits, nhashes = _dimensions(capacity, error_rate)
+        buf = bytearray(_HEADER.size + (nbits + 7) // 8)
+        _HEADER.pack_into(buf, 0, _MAGIC, nbits, nhashes, 0)
+        self._setup(buf, False)
+
+    @classmethod
+    def create(cls, path, capacity, error_rate=0.01):
+        """Create a new filter backed by a memory-mapped file."""
+        nbits, nhashes = _dimensions(capacity, error_rate)
+        with open(path, 'w+b') as f:
+            f.truncate(_HEADER.size + (nbits + 7) // 8)
+            f.write(_HEADER.pack(_MAGIC, nbits, nhashes, 0))
+            f.flush()
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE)
+        result = cls.__new__(cls)
+        result._setup(buf, False)
+        return result
+
+    @classmethod
+    def open(cls, path, readonly=True):
+        """Open a filter file created by :meth:`create`."""
+        with open(path, 'rb' if readonly else 'r+b') as f:
+            if readonly:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE)
+        result = cls.__new__(cls)
+        try:
+            result._setup(buf, readonly)
+        except ValueError:
+            buf.close()
+            raise
+        return result
+
+    def _setup(self, buf, readonly):
+        if len(buf) < _HEADER.size:
+            raise ValueError('Invalid filter file')
+        magic, nbits, nhashes, _ = _HEADER.unpack_from(buf)
+        if magic != _MAGIC or len(buf) != _HEADER.size + (nbits + 7) // 8:
+            raise ValueError('Invalid filter file')
+        self._buf = buf
+        self._nbits = nbits
+        self._nhashes = nhashes
+        self._readonly = readonly
+
+    def __len__(self):
+        return _COUNT.unpack_from(self._buf, _COUNT_OFFSET)[0]
+
+    def __contains__(self, uri):
+        buf = self._buf
+        offset = _HEADER.size
+        for i in self._indexes(uri):
+            if not buf[offset + (i >> 3)] & (1 << (i & 7)):
+                return False
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _indexes(self, uri):
+        # hash the normalized URI once and derive the bit indexes by
+        # double hashing
+        h = urifingerprint(uri, 128)
+        # an odd step never maps all probes to the same bit
+        h1, h2 = h >> 64, h & _MASK64 | 1
+        nbits = self._nbits
+        return [(h1 + i * h2) % nbits for i in range(self._nhashes)]
+
+    def add(self, uri):
+        """Add `uri` to the filter, and return :const:`True` if it was
+        not already present.
+
+        """
+        if self._readonly:
+            raise ValueError('Filter is read-only')
+        buf = self._buf
+        offset = _HEADER.size
+        added = False
+        for i in self._indexes(uri):
+            pos = offset + (i >> 3)
+            mask = 1 << (i & 7)
+            byte = buf[pos]
+            if not byte & mask:
+                buf[pos] = byte | mask
+                added = True
+        if added:
+            _COUNT.pack_into(buf, _COUNT_OFFSET, len(self) + 1)
+        return added
+
+    def add_many(self, uris):
+        """Add all `uris` to the filter, and return a list of booleans
+        indicating which were not already present.
+
+        """
+        return [self.add(uri) for uri in uris]
+
+    def contains_many(self, uris):
+        """Return a list of booleans indicating which of `uris` are
+        present in the filter.
+
+        """
+        return [uri in self for uri in uris]
+
+    def flush(self):
+        """Write changes to a memory-mapped filter file to disk."""
+        if isinstance(self._buf, mmap.mmap) and not self._readonly:
+            self._buf.flush()
+
+    def close(self):
+        """Close the memory-mapped filter file, if any."""
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
@@ -1,8 +1,15 @@
 import collections
 import ipaddress
+import numbers
 import re
 
-from .encoding import uridecode_safe, uridecode_safe_plus, idndecode
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+from .encoding import (idndecode, uridecode_safe, uridecode_safe_plus,
+                       uriencode_plus)
 
 _URI_COMPONENTS = ('scheme', 'authority', 'path', 'query', 'fragment')
 
@@ -147,7 +154,7 @@ class SplitResult(collections.namedtuple('SplitResult', _URI_COMPONENTS)):
 
     def getpath(self, encoding='utf-8', errors='replace'):
         """Return the normalized decoded URI path."""
-        path = self.__remove_dot_segments(self.path)
+        path = self._remove_dot_segments(self.path)
         return uridecode_safe(path, encoding, errors)
 
     def getquery(self, default=None, encoding='utf-8', errors='replace'):
@@ -191,6 +198,93 @@ class SplitResult(collections.namedtuple('SplitResult', _URI_COMPONENTS)):
         else:
             return uridecode_safe_plus(fragment, encoding, errors)
 
+    def with_query(self, add=(), remove=(), set=(), encoding='utf-8'):
+        """Return a copy of the URI with the query parameters in `add`
+        appended, all parameters named in `remove` removed, and the
+        parameters in `set` replaced.
+
+        """
+        if isinstance(add, Mapping):
+            add = add.items()
+        if isinstance(set, Mapping):
+            set = set.items()
+        replace = collections.OrderedDict()
+        for name, value in set:
+            replace[self._native(name, encoding)] = value
+        removed = frozenset([self._native(name, encoding) for name in remove])
+        removed = removed.union(replace)
+        query = self.query
+        terms = []
+        if query is not None:
+            # keep unchanged parameters and their separators verbatim,
+            # but drop empty terms and thus stray separators
+            tokens = self.QUERYSEP_RE.split(query)
+            for i in range(0, len(tokens), 2):
+                pair = tokens[i]
+                if not pair:
+                    continue
+                sep = tokens[i - 1] if i else self.AMP
+                if removed:
+                    name = uridecode_safe_plus(pair.partition(self.EQ)[0],
+                                               encoding)
+                    if name in removed:
+                        if name in replace:
+                            value = replace.pop(name)
+                            terms.append((sep, self._queryterm(name, value,
+                                                               encoding)))
+                        continue
+                terms.append((sep, pair))
+        for name, value in replace.items():
+            terms.append((self.AMP, self._queryterm(name, value, encoding)))
+        for name, value in add:
+            terms.append((self.AMP, self._queryterm(name, value, encoding)))
+        if not terms:
+            return self._replace(query=None)
+        parts = [terms[0][1]]
+        for sep, pair in terms[1:]:
+            parts.extend([sep, pair])
+        return self._replace(query=self.EMPTY.join(parts))
+
+    def with_path(self, path, encoding='utf-8'):
+        """Return a copy of the URI with its path component replaced by
+        the encoded `path`.
+
+        """
+        # imported here, since the compose module depends on this one
+        from .compose import _Bytes, _String, _path
+
+        t = _Bytes if isinstance(self.EMPTY, bytes) else _String
+        path = _path(self._native(path, encoding), self.scheme,
+                     self.authority, encoding, t)
+        return self._replace(path=path)
+
+    def with_host(self, host, encoding='utf-8'):
+        """Return a copy of the URI with the host subcomponent of its
+        authority replaced by the encoded `host`.
+
+        """
+        # imported here, since the compose module depends on this one
+        from .compose import _Bytes, _String, _authority
+
+        t = _Bytes if isinstance(self.EMPTY, bytes) else _String
+        authority = [_authority(None, host, None, encoding, t) or self.EMPTY]
+        userinfo = self.userinfo
+        if userinfo is not None:
+            authority[:0] = [userinfo, self.AT]
+        port = self.port
+        if port is not None:
+            authority.extend([self.COLON, port])
+        if self.path and not self.path.startswith(self.SLASH):
+            raise ValueError('Invalid path with authority component')
+        return self._replace(authority=self.EMPTY.join(authority))
+
+    def _queryterm(self, name, value, encoding):
+        name = uriencode_plus(self._native(name, encoding), '', encoding)
+        if value is None:
+            return name
+        value = uriencode_plus(self._native(value, encoding), '', encoding)
+        return name + self.EQ + value
+
     def transform(self, ref, strict=False):
         """Transform a URI reference relative to `self` into a
         :class:`SplitResult` representing its target URI.
@@ -200,10 +294,10 @@ class SplitResult(collections.namedtuple('SplitResult', _URI_COMPONENTS)):
 
         # RFC 3986 5.2.2. Transform References
         if scheme is not None and (strict or scheme != self.scheme):
-            path = self.__remove_dot_segments(path)
+            path = self._remove_dot_segments(path)
         elif authority is not None:
             scheme = self.scheme
-            path = self.__remove_dot_segments(path)
+            path = self._remove_dot_segments(path)
         elif not path:
             scheme = self.scheme
             authority = self.authority
@@ -212,11 +306,11 @@ class SplitResult(collections.namedtuple('SplitResult', _URI_COMPONENTS)):
         elif path.startswith(self.SLASH):
             scheme = self.scheme
             authority = self.authority
-            path = self.__remove_dot_segments(path)
+            path = self._remove_dot_segments(path)
         else:
             scheme = self.scheme
             authority = self.authority
-            path = self.__remove_dot_segments(self.__merge(path))
+            path = self._remove_dot_segments(self.__merge(path))
         return type(self)(scheme, authority, path, query, fragment)
 
     def __merge(self, path):
@@ -228,7 +322,7 @@ class SplitResult(collections.namedtuple('SplitResult', _URI_COMPONENTS)):
             return parts[1].join((parts[0], path))
 
     @classmethod
-    def __remove_dot_segments(cls, path):
+    def _remove_dot_segments(cls, path):
         # RFC 3986 5.2.4. Remove Dot Segments
         pseg = []
         for s in path.split(cls.SLASH):
@@ -271,12 +365,23 @@ class SplitResultBytes(SplitResult):
     # RFC 3986 3.3 dot-segments
     DOT, DOTDOT = b'.', b'..'
 
-    EMPTY, EQ = b'', b'='
+    EMPTY, EQ, AMP = b'', b'=', b'&'
 
     DIGITS = b'0123456789'
 
     QUERYSEP = (b';', b'&')
 
+    QUERYSEP_RE = re.compile(b'([;&])')
+
+    @staticmethod
+    def _native(value, encoding):
+        if isinstance(value, numbers.Number):
+            return str(value).encode('ascii')
+        elif isinstance(value, str):
+            return value.encode(encoding)
+        else:
+            return bytes(value)
+
 
 class SplitResultString(SplitResult):
 
@@ -297,14 +402,23 @@ class SplitResultString(SplitResult):
     # RFC 3986 3.3 dot-segments
     DOT, DOTDOT = '.', '..'
 
-    EMPTY, EQ = '', '='
+    EMPTY, EQ, AMP = '', '=', '&'
 
     DIGITS = '0123456789'
 
     QUERYSEP = ';&'
 
+    QUERYSEP_RE = re.compile('([;&])')
+
+    @staticmethod
+    def _native(value, encoding):
+        if isinstance(value, numbers.Number):
+            return str(value)
+        else:
+            return value
+
 
-def urisplit(uristring):
+def urisplit(uristring, intern=None):
     """Split a well-formed URI string into a tuple with five components
     corresponding to a URI's general structure::
 
@@ -315,7 +429,61 @@ def urisplit(uristring):
         result = SplitResultBytes
     else:
         result = SplitResultString
-    return result(*result.RE.match(uristring).groups())
+    parts = result.RE.match(uristring).groups()
+    if intern is not None:
+        parts = intern._apply(parts)
+    return result(*parts)
+
+
+def urisplit_many(uristrings, intern=None):
+    """Return a list of the split results of all `uristrings`."""
+    return [urisplit(uristring, intern) for uristring in uristrings]
+
+
+class InternTable(object):
+    """Bounded table of URI components shared between split results."""
+
+    def __init__(self, maxsize=65536, paths=False):
+        if maxsize < 1:
+            raise ValueError('Invalid table size')
+        self.maxsize = maxsize
+        self.paths = paths
+        self._table = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._table)
+
+    def intern(self, value):
+        """Return the interned object equal to `value`, adding `value`
+        to the table if there is none.
+
+        """
+        table = self._table
+        try:
+            result = table[value]
+        except KeyError:
+            table[value] = value
+            # evict the least recently used component
+            if len(table) > self.maxsize:
+                table.popitem(last=False)
+            return value
+        table.move_to_end(value)
+        return result
+
+    def clear(self):
+        """Remove all components from the table."""
+        self._table.clear()
+
+    def _apply(self, parts):
+        scheme, authority, path, query, fragment = parts
+        intern = self.intern
+        if scheme is not None:
+            scheme = intern(scheme)
+        if authority is not None:
+            authority = intern(authority)
+        if self.paths:
+            path = intern(path)
+        return scheme, authority, path, query, fragment
 
 
 def uriunsplit(parts):
@@ -354,3 +522,103 @@ def querylist(query, encoding='utf-8', errors='replace'):
             value = None
         items.append((name, value))
     return items
+
+
+_FORMSEP_STRING = re.compile('[;&]')
+
+_FORMSEP_BYTES = re.compile(b'[;&]')
+
+
+class FormParser(object):
+    """Incremental parser for ``application/x-www-form-urlencoded``
+    data.
+
+    """
+
+    def __init__(self, encoding='utf-8', errors='replace', maxpairs=None,
+                 maxfieldsize=None):
+        self.encoding = encoding
+        self.errors = errors
+        self.maxpairs = maxpairs
+        self.maxfieldsize = maxfieldsize
+        self._count = 0
+        self._parts = []  # parts of the current incomplete pair
+        self._size = 0
+        self._eq = None  # offset of "=" in the current pair
+
+    def feed(self, data):
+        """Parse the next chunk of data and return a list of the
+        `(name, value)` tuples completed by it.
+
+        """
+        if isinstance(data, (bytearray, memoryview)):
+            data = bytes(data)
+        if isinstance(data, bytes):
+            segments = _FORMSEP_BYTES.split(data)
+        else:
+            segments = _FORMSEP_STRING.split(data)
+        if len(segments) == 1:
+            self._append(data)
+            return []
+        items = []
+        if self._parts:
+            self._parts.append(segments[0])
+            segments[0] = segments[0][:0].join(self._parts)
+        for segment in segments[:-1]:
+            if segment:
+                items.append(self._pair(segment))
+        self._parts = []
+        self._size = 0
+        self._eq = None
+        self._append(segments[-1])
+        return items
+
+    def close(self):
+        """Finish parsing and return a list of the remaining `(name,
+        value)` tuples.
+
+        """
+        parts = self._parts
+        self._parts = []
+        self._size = 0
+        self._eq = None
+        if parts:
+            return [self._pair(parts[0][:0].join(parts))]
+        else:
+            return []
+
+    def _append(self, data):
+        if not data:
+            return
+        if self._eq is None:
+            i = data.find(b'=' if isinstance(data, bytes) else '=')
+            if i >= 0:
+                self._eq = self._size + i
+        self._parts.append(data)
+        self._size += len(data)
+        if self.maxfieldsize is not None:
+            # check the incomplete name or value as early as possible
+            if self._eq is None:
+                size = self._size
+            else:
+                size = max(self._eq, self._size - self._eq - 1)
+            if size > self.maxfieldsize:
+                raise ValueError('Form field too large')
+
+    def _pair(self, segment):
+        self._count += 1
+        if self.maxpairs is not None and self._count > self.maxpairs:
+            raise ValueError('Too many form fields')
+        if isinstance(segment, bytes):
+            name, eq, value = segment.partition(b'=')
+        else:
+            name, eq, value = segment.partition('=')
+        if self.maxfieldsize is not None:
+            if max(len(name), len(value)) > self.maxfieldsize:
+                raise ValueError('Form field too large')
+        name = uridecode_safe_plus(name, self.encoding, self.errors)
+        if eq:
+            value = uridecode_safe_plus(value, self.encoding, self.errors)
+        else:
+            value = None
+        return (name, value)
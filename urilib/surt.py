@@ -0,0 +1,41 @@
+from .normalize import _urinormalize
+from .split import (SplitResultBytes, SplitResultString, _ipv4_address,
+                    uriunsplit)
+
+
+def _reversehost(host, result, comma):
+    # IP addresses are kept as they are
+    if host.startswith(result.LBRACKET) or _ipv4_address(host):
+        return host
+    labels = host.split(result.DOT)
+    labels.reverse()
+    return comma.join(labels)
+
+
+def urisurt(uri):
+    """Return the Sort-friendly URI Reordering Transform (SURT) key of
+    the normalized form of `uri`.
+
+    """
+    scheme, authority, path, query, _ = _urinormalize(uri)
+    if authority is None:
+        return uriunsplit((scheme, authority, path, query, None))
+    if isinstance(path, bytes):
+        result, comma, rparen = SplitResultBytes, b',', b')'
+    else:
+        result, comma, rparen = SplitResultString, ',', ')'
+    # parse host and port from the normalized authority
+    result = result(scheme, authority, path, query, None)
+    key = [_reversehost(result.host, result, comma)]
+    port = result.port
+    if port:
+        key.extend([result.COLON, port])
+    key.extend([rparen, path])
+    if query is not None:
+        key.extend([result.QUEST, query])
+    return result.EMPTY.join(key)
+
+
+def urisurt_many(uris):
+    """Return a list of the SURT keys of all `uris`."""
+    return [urisurt(uri) for uri in uris]
@@ -0,0 +1,203 @@
+import array
+import mmap
+import struct
+import sys
+
+from .normalize import urinormalize
+
+# magic, number of URIs, number of blocks, string flag
+_HEADER = struct.Struct('<8sQQQ')
+
+_MAGIC = b'URISET02'
+
+
+def _encodevarint(value, out):
+    while value >= 0x80:
+        out.append(value & 0x7f | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _decodevarint(buf, pos):
+    result = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _canonical(uri):
+    uri = urinormalize(uri)
+    if isinstance(uri, bytes):
+        return uri
+    else:
+        return uri.encode('utf-8')
+
+
+class URISet(object):
+    """Immutable set of normalized URIs stored in a front-coded,
+    block-compressed buffer.
+
+    """
+
+    def __init__(self, uris=(), blocksize=16):
+        if blocksize < 1:
+            raise ValueError('Invalid block size')
+        keys = set()
+        isstring = set()
+        for uri in uris:
+            isstring.add(isinstance(uri, str))
+            keys.add(_canonical(uri))
+        if len(isstring) > 1:
+            raise TypeError('URIs must be all strings or all bytes')
+        keys = sorted(keys)
+        data = bytearray()
+        offsets = array.array('Q')
+        prev = b''
+        for i, key in enumerate(keys):
+            shared = 0
+            if i % blocksize:
+                limit = min(len(prev), len(key))
+                while shared < limit and prev[shared] == key[shared]:
+                    shared += 1
+            else:
+                # every block starts with an uncompressed key
+                offsets.append(len(data))
+            _encodevarint(shared, data)
+            _encodevarint(len(key) - shared, data)
+            data.extend(key[shared:])
+            prev = key
+        self._setup(len(keys), offsets, memoryview(bytes(data)),
+                    False not in isstring, None)
+
+    def _setup(self, count, offsets, data, isstring, mm):
+        self._count = count
+        self._offsets = offsets
+        self._data = data
+        self._isstring = isstring
+        self._mmap = mm
+
+    @classmethod
+    def load(cls, path):
+        """Load a set written by :meth:`save` from a memory-mapped
+        file.
+
+        """
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, count, nblocks, isstring = _HEADER.unpack_from(mm)
+            if magic != _MAGIC:
+                raise ValueError('Invalid URI set file')
+            start = _HEADER.size
+            end = start + 8 * nblocks
+            if sys.byteorder == 'little':
+                offsets = memoryview(mm)[start:end].cast('Q')
+            else:
+                offsets = array.array('Q', mm[start:end])
+                offsets.byteswap()
+            data = memoryview(mm)[end:]
+        except (TypeError, ValueError, struct.error):
+            mm.close()
+            raise ValueError('Invalid URI set file')
+        result = cls.__new__(cls)
+        result._setup(count, offsets, data, bool(isstring), mm)
+        return result
+
+    def save(self, path):
+        """Write the set to a file that can be loaded by :meth:`load`."""
+        offsets = array.array('Q', self._offsets)
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, self._count, len(offsets),
+                                 self._isstring))
+            f.write(offsets.tobytes())
+            f.write(self._data)
+
+    def close(self):
+        """Close the memory-mapped file of a loaded set, if any."""
+        if self._mmap is not None:
+            if isinstance(self._offsets, memoryview):
+                self._offsets.release()
+            self._data.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for i in range(len(self._offsets)):
+            for key in self._block(i):
+                yield self._item(key)
+
+    def __contains__(self, uri):
+        key = _canonical(uri)
+        for other in self._block(self._find(key)):
+            if other >= key:
+                return other == key
+        return False
+
+    def prefix(self, prefix):
+        """Iterate over all URIs in the set starting with `prefix`, in
+        sorted order.
+
+        """
+        if not isinstance(prefix, bytes):
+            prefix = prefix.encode('utf-8')
+        for i in range(self._find(prefix), len(self._offsets)):
+            for key in self._block(i):
+                if key.startswith(prefix):
+                    yield self._item(key)
+                elif key > prefix:
+                    return
+
+    def _item(self, key):
+        # return keys as the type of URIs the set was created from
+        if self._isstring:
+            return key.decode('utf-8')
+        else:
+            return key
+
+    def _first(self, i):
+        data = self._data
+        _, pos = _decodevarint(data, self._offsets[i])
+        length, pos = _decodevarint(data, pos)
+        return data[pos:pos + length].tobytes()
+
+    def _find(self, key):
+        # index of the last block whose first key is not greater than
+        # key, or zero
+        lo, hi = 0, len(self._offsets)
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if self._first(mid) <= key:
+                lo = mid
+            else:
+                hi = mid
+        return lo
+
+    def _block(self, i):
+        data = self._data
+        offsets = self._offsets
+        if i >= len(offsets):
+            return
+        pos = offsets[i]
+        end = offsets[i + 1] if i + 1 < len(offsets) else len(data)
+        key = b''
+        while pos < end:
+            shared, pos = _decodevarint(data, pos)
+            length, pos = _decodevarint(data, pos)
+            key = key[:shared] + data[pos:pos + length].tobytes()
+            pos += length
+            yield key
@@ -0,0 +1,146 @@
+from .encoding import uridecode_safe
+from .normalize import _default_port
+from .split import urisplit
+
+_missing = object()
+
+# host label matching one or more subdomain labels
+_WILDCARD = '*'
+
+
+def _keys(uri):
+    result = urisplit(uri)
+    scheme = result.getscheme()
+    host = result.gethost()
+    if host is None or host == result.EMPTY:
+        labels = []
+    elif isinstance(host, (str, bytes)):
+        labels = host.rstrip(result.DOT).split(result.DOT)
+        labels.reverse()
+    else:
+        labels = [host]  # IP address
+    port = result.getport()
+    if port == _default_port.get(scheme):
+        port = None
+    # segments are decoded after splitting, so that encoded slashes
+    # are not mistaken for separators
+    path = result._remove_dot_segments(result.path)
+    segments = path.split(result.SLASH)
+    # absolute paths start and directory paths end with empty
+    # segments, which are ignored
+    if segments[0] == result.EMPTY:
+        del segments[0]
+    if segments and segments[-1] == result.EMPTY:
+        del segments[-1]
+    return scheme, labels, port, [uridecode_safe(s) for s in segments]
+
+
+class URITrie(object):
+    """Mapping of URI prefixes to values, supporting longest-prefix
+    lookups.
+
+    """
+
+    def __init__(self, items=()):
+        # nodes are integers, edges are stored in a single dictionary
+        # keyed on (parent node, label) for compactness
+        self._edges = {}
+        self._values = {}
+        self._nodes = 1
+        self.update(items)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __setitem__(self, uri, value):
+        scheme, labels, port, segments = _keys(uri)
+        node = self._child(0, scheme)
+        for label in labels:
+            node = self._child(node, label)
+        # the port, an integer or None, terminates the host labels
+        node = self._child(node, port)
+        for segment in segments:
+            node = self._child(node, segment)
+        self._values[node] = value
+
+    def __getitem__(self, uri):
+        scheme, labels, port, segments = _keys(uri)
+        node = self._find(0, [scheme] + labels + [port] + segments)
+        if node is None or node not in self._values:
+            raise KeyError(uri)
+        return self._values[node]
+
+    def __contains__(self, uri):
+        try:
+            self[uri]
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def update(self, items):
+        """Add all `(uri, value)` items, or all items of a mapping."""
+        if hasattr(items, 'items'):
+            items = items.items()
+        for uri, value in items:
+            self[uri] = value
+
+    def longest_prefix(self, uri, default=None):
+        """Return the value of the longest prefix of `uri` in the trie,
+        or `default` if there is none.
+
+        """
+        scheme, labels, port, segments = _keys(uri)
+        edges = self._edges
+        node = edges.get((0, scheme))
+        if node is None:
+            return default
+        # collect matching host nodes, least specific first
+        hosts = []
+        for label in labels:
+            wildcard = edges.get((node, _WILDCARD))
+            if wildcard is not None:
+                hosts.append(wildcard)
+            node = edges.get((node, label))
+            if node is None:
+                break
+        else:
+            hosts.append(node)
+        values = self._values
+        for node in reversed(hosts):
+            node = edges.get((node, port))
+            if node is None:
+                continue
+            value = values.get(node, _missing)
+            for segment in segments:
+                node = edges.get((node, segment))
+                if node is None:
+                    break
+                value = values.get(node, value)
+            if value is not _missing:
+                return value
+        return default
+
+    def longest_prefix_many(self, uris, default=None):
+        """Return a list of the values of the longest prefixes of all
+        `uris`.
+
+        """
+        return [self.longest_prefix(uri, default) for uri in uris]
+
+    def _child(self, node, label):
+        key = (node, label)
+        try:
+            return self._edges[key]
+        except KeyError:
+            child = self._edges[key] = self._nodes
+            self._nodes += 1
+            return child
+
+    def _find(self, node, labels):
+        edges = self._edges
+        for label in labels:
+            node = edges.get((node, label))
+            if node is None:
+                return None
+        return node